@@ -0,0 +1,603 @@
+"""
+Content analysis for SCORM-Maker.
+
+This module extracts metadata from content files, such as PDF page counts,
+video durations and HTML titles. Analyzers are registered per content type
+(as returned by ``get_content_type``) and only read the parts of a file they
+need. Files are analyzed in worker processes, and results are cached by a
+fingerprint of the file content.
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .utils import get_cache_dir
+
+# Bump this whenever analyzer output changes so stale cache entries are ignored
+ANALYZER_VERSION = '1'
+
+# Bytes read from each end of a file to fingerprint it
+FINGERPRINT_SAMPLE_SIZE = 1024 * 1024
+
+# Bytes read from each end of a PDF when looking for metadata
+PDF_READ_SIZE = 64 * 1024
+
+# Maximum number of bytes of an HTML file parsed when looking for its title
+HTML_READ_LIMIT = 256 * 1024
+
+# Maximum number of bytes of a WebM file scanned for its duration
+WEBM_READ_LIMIT = 1024 * 1024
+
+# Below this many files, analysis runs in-process rather than in a pool
+POOL_THRESHOLD = 8
+
+# Analyzer functions keyed by content type
+ANALYZERS: Dict[str, Callable[[Path], Dict]] = {}
+
+
+def register_analyzer(content_type: str) -> Callable:
+    """
+    Register an analyzer for a content type.
+
+    Analyzers take the path of a file and return a dictionary of metadata.
+    They run in worker processes, so they must be module-level functions
+    registered when their module is imported.
+
+    Args:
+        content_type (str): The content type, as returned by get_content_type.
+
+    Returns:
+        Callable: A decorator that registers the analyzer.
+    """
+    def decorator(func):
+        ANALYZERS[content_type] = func
+        return func
+    return decorator
+
+
+def fingerprint_file(path: Path) -> str:
+    """
+    Compute a content fingerprint for a file.
+
+    The fingerprint hashes the file size with the first and last megabyte of
+    the file, so it costs the same for a 10 GB video as for a small page.
+
+    Args:
+        path (Path): Path to the file.
+
+    Returns:
+        str: Hex digest identifying the file content.
+    """
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(str(size).encode('ascii'))
+        digest.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+        if size > 2 * FINGERPRINT_SAMPLE_SIZE:
+            f.seek(-FINGERPRINT_SAMPLE_SIZE, os.SEEK_END)
+        digest.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+
+    return digest.hexdigest()
+
+
+def analyze_file(path: Path, content_type: str) -> Tuple[str, Dict]:
+    """
+    Fingerprint and analyze a single file.
+
+    Args:
+        path (Path): Path to the file.
+        content_type (str): The content type of the file.
+
+    Returns:
+        Tuple[str, Dict]: The file fingerprint and the extracted metadata.
+            Metadata is empty if the file could not be analyzed.
+    """
+    fingerprint = fingerprint_file(path)
+
+    # Analysis never fails a build; truncated or malformed files just have
+    # no metadata
+    try:
+        metadata = ANALYZERS[content_type](path)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError, EOFError):
+        metadata = {}
+
+    return fingerprint, metadata
+
+
+def analyze_content(content_items: List[Dict], config: Dict) -> None:
+    """
+    Add metadata to content items.
+
+    Each item with a registered analyzer gets a ``metadata`` dictionary.
+    Items that were not given a title in the configuration take the title
+    found in the file, if any. Items read from an archive are not analyzed.
+
+    Analysis can be turned off with ``build.analyze_content: false``, and
+    the number of worker processes set with ``build.analyzer_workers``.
+
+    Args:
+        content_items (List[Dict]): List of processed content items.
+        config (Dict): Configuration dictionary.
+    """
+    build = config.get('build', {})
+    if not build.get('analyze_content', True):
+        return
+
+    cache_path = get_cache_dir(config) / 'analysis.json'
+    cache = load_analysis_cache(cache_path)
+
+    # Look items up by file stat first so unchanged files are not read at all
+    pending = []
+    seen = set()
+    for item in content_items:
+        item.setdefault('metadata', {})
+        file_path = item.get('file_path')
+        if file_path is None or item['type'] not in ANALYZERS:
+            continue
+
+        stat_key = get_stat_key(file_path)
+        seen.add(stat_key)
+        fingerprint = cache['stats'].get(stat_key)
+        if fingerprint is not None and fingerprint in cache['results']:
+            item['metadata'] = dict(cache['results'][fingerprint])
+        else:
+            pending.append((item, stat_key))
+
+    if pending:
+        paths = [item['file_path'] for item, _ in pending]
+        types = [item['type'] for item, _ in pending]
+
+        if len(pending) < POOL_THRESHOLD:
+            results = list(map(analyze_file, paths, types))
+        else:
+            with ProcessPoolExecutor(max_workers=build.get('analyzer_workers')) as executor:
+                results = list(executor.map(analyze_file, paths, types, chunksize=16))
+
+        for (item, stat_key), (fingerprint, metadata) in zip(pending, results):
+            item['metadata'] = metadata
+            cache['stats'][stat_key] = fingerprint
+            cache['results'][fingerprint] = metadata
+
+    # Keep the cache from growing with every file ever analyzed
+    pruned = prune_stat_keys(cache['stats'], seen)
+    fingerprints = set(cache['stats'].values())
+    unused = [fingerprint for fingerprint in cache['results'] if fingerprint not in fingerprints]
+    for fingerprint in unused:
+        del cache['results'][fingerprint]
+
+    if pending or pruned or unused:
+        save_analysis_cache(cache_path, cache)
+
+    # Titles found in the files replace titles derived from file names
+    configured_files = {item['file'] for item in config.get('content_items', [])}
+    for item in content_items:
+        title = item['metadata'].get('title')
+        if title and str(item['rel_path']) not in configured_files:
+            item['title'] = title
+
+
+def get_stat_key(path: Path) -> str:
+    """
+    Build a cache key from a file's path, size and modification time.
+
+    Args:
+        path (Path): Path to the file.
+
+    Returns:
+        str: The cache key.
+    """
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def prune_stat_keys(cache: Dict, seen: Iterable[str] = ()) -> int:
+    """
+    Remove cache entries for files that were removed or have changed.
+
+    Stat keys include the absolute path of the file, so without pruning a
+    cache keyed by them grows with every input ever built, such as the
+    temporary directories of CI runs. Entries for other inputs that are
+    still unchanged are kept.
+
+    Args:
+        cache (Dict): Cache entries keyed by get_stat_key.
+        seen (Iterable[str], optional): Keys used by the current build,
+            which are known to be current.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    seen = set(seen)
+    stale = []
+    for stat_key in cache:
+        if stat_key in seen:
+            continue
+        try:
+            if get_stat_key(stat_key.rsplit('|', 2)[0]) != stat_key:
+                stale.append(stat_key)
+        except OSError:
+            stale.append(stat_key)
+
+    for stat_key in stale:
+        del cache[stat_key]
+
+    return len(stale)
+
+
+def load_analysis_cache(cache_path: Path) -> Dict:
+    """
+    Load the analysis cache.
+
+    Args:
+        cache_path (Path): Path to the cache file.
+
+    Returns:
+        Dict: The cache, or an empty cache if it is missing, unreadable or
+            was written by a different analyzer version.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == ANALYZER_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+
+    return {'version': ANALYZER_VERSION, 'stats': {}, 'results': {}}
+
+
+def save_analysis_cache(cache_path: Path, cache: Dict) -> None:
+    """
+    Save the analysis cache.
+
+    Args:
+        cache_path (Path): Path to the cache file.
+        cache (Dict): The cache to save.
+    """
+    try:
+        os.makedirs(cache_path.parent, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is an optimization; a read-only cache is not an error
+        pass
+
+
+@register_analyzer('pdf')
+def analyze_pdf(path: Path) -> Dict:
+    """
+    Extract the page count and title of a PDF.
+
+    Only the start of the file (where linearized PDFs keep their page count)
+    and the end (where the trailer and usually the document info live) are
+    read. PDFs that keep this information in compressed object streams
+    yield no metadata.
+
+    Args:
+        path (Path): Path to the PDF file.
+
+    Returns:
+        Dict: ``pages`` and ``title`` where found.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(PDF_READ_SIZE)
+        tail = b''
+        if size > PDF_READ_SIZE:
+            f.seek(max(PDF_READ_SIZE, size - PDF_READ_SIZE))
+            tail = f.read()
+
+    data = head + b'\n' + tail
+    metadata = {}
+
+    # Linearized PDFs give the page count in their first object
+    match = re.search(rb'/Linearized\s.*?/N\s+(\d+)', head[:2048], re.DOTALL)
+    if match:
+        metadata['pages'] = int(match.group(1))
+    else:
+        counts = [
+            int(count)
+            for count in re.findall(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)', data)
+            + re.findall(rb'/Count\s+(\d+)[^>]*?/Type\s*/Pages\b', data)
+        ]
+        if counts:
+            # The root of the page tree has the largest count
+            metadata['pages'] = max(counts)
+
+    match = re.search(rb'/Title\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)', data)
+    if match:
+        title = decode_pdf_string(match.group(1)).strip()
+        if title:
+            metadata['title'] = title
+
+    return metadata
+
+
+def decode_pdf_string(value: bytes) -> str:
+    """
+    Decode a PDF literal or hexadecimal string.
+
+    Args:
+        value (bytes): The string, including its delimiters.
+
+    Returns:
+        str: The decoded text.
+    """
+    if value.startswith(b'<'):
+        raw = bytes.fromhex(re.sub(rb'\s', b'', value[1:-1]).decode('ascii'))
+    else:
+        escapes = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+        def unescape(match):
+            escaped = match.group(1)
+            if escaped[:1].isdigit():
+                return bytes([int(escaped, 8) & 0xFF])
+            return escapes.get(escaped, escaped)
+
+        raw = re.sub(rb'\\([0-7]{1,3}|.)', unescape, value[1:-1], flags=re.DOTALL)
+
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', errors='replace')
+
+    return raw.decode('latin-1')
+
+
+@register_analyzer('video')
+def analyze_video(path: Path) -> Dict:
+    """
+    Extract the duration of an MP4 or WebM video from its container header.
+
+    Args:
+        path (Path): Path to the video file.
+
+    Returns:
+        Dict: ``duration`` in seconds, where found.
+    """
+    extension = path.suffix.lower()
+    if extension == '.mp4':
+        duration = read_mp4_duration(path)
+    elif extension == '.webm':
+        duration = read_webm_duration(path)
+    else:
+        duration = None
+
+    return {'duration': round(duration, 3)} if duration else {}
+
+
+def read_mp4_duration(path: Path) -> Optional[float]:
+    """
+    Read the duration of an MP4 file from its movie header box.
+
+    Top-level boxes are skipped by seeking, so the media data is never read,
+    even when the 'moov' box is at the end of the file.
+
+    Args:
+        path (Path): Path to the MP4 file.
+
+    Returns:
+        Optional[float]: Duration in seconds, or None if not found.
+    """
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+
+        for box_type, start, end in iter_mp4_boxes(f, 0, file_size):
+            if box_type != b'moov':
+                continue
+
+            for child_type, child_start, _ in iter_mp4_boxes(f, start, end):
+                if child_type != b'mvhd':
+                    continue
+
+                f.seek(child_start)
+                header = f.read(4)
+                if not header:
+                    return None
+                version = header[0]
+                if version == 1:
+                    _, _, timescale, duration = struct.unpack('>QQIQ', f.read(28))
+                else:
+                    _, _, timescale, duration = struct.unpack('>IIII', f.read(16))
+
+                return duration / timescale if timescale else None
+
+    return None
+
+
+def iter_mp4_boxes(f, start: int, end: int):
+    """
+    Iterate over the boxes between two offsets of an MP4 file.
+
+    Args:
+        f: Binary file object.
+        start (int): Offset of the first box.
+        end (int): Offset just past the last box.
+
+    Yields:
+        tuple: ``(box_type, payload_start, box_end)`` for each box.
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        header_size = 8
+
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+
+        if size < header_size:
+            return
+
+        yield box_type, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+# EBML element IDs used by WebM
+EBML_SEGMENT = 0x18538067
+EBML_INFO = 0x1549A966
+EBML_TIMECODE_SCALE = 0x2AD7B1
+EBML_DURATION = 0x4489
+EBML_CLUSTER = 0x1F43B675
+
+
+def read_webm_duration(path: Path) -> Optional[float]:
+    """
+    Read the duration of a WebM file from its segment information.
+
+    Args:
+        path (Path): Path to the WebM file.
+
+    Returns:
+        Optional[float]: Duration in seconds, or None if not found.
+    """
+    with open(path, 'rb') as f:
+        data = f.read(WEBM_READ_LIMIT)
+
+    # Skip the EBML header and find the segment
+    offset = 0
+    while offset < len(data):
+        element_id, offset = read_ebml_id(data, offset)
+        size, offset = read_ebml_size(data, offset)
+        if element_id == EBML_SEGMENT:
+            break
+        offset += size
+    else:
+        return None
+
+    timecode_scale = 1000000
+    duration = None
+
+    # Scan the segment's children up to the first cluster
+    while offset < len(data):
+        element_id, offset = read_ebml_id(data, offset)
+        size, offset = read_ebml_size(data, offset)
+
+        if element_id == EBML_CLUSTER:
+            break
+
+        if element_id == EBML_INFO:
+            end = min(offset + size, len(data))
+            while offset < end:
+                child_id, offset = read_ebml_id(data, offset)
+                child_size, offset = read_ebml_size(data, offset)
+                value = data[offset:offset + child_size]
+                if child_id == EBML_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(value, 'big')
+                elif child_id == EBML_DURATION:
+                    duration = struct.unpack('>f' if child_size == 4 else '>d', value)[0]
+                offset += child_size
+            break
+
+        offset += size
+
+    if duration is None:
+        return None
+
+    return duration * timecode_scale / 1e9
+
+
+def read_ebml_id(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read an EBML element ID, returning it and the offset after it."""
+    if offset >= len(data):
+        raise ValueError("Truncated EBML element ID")
+    first = data[offset]
+    length = 1
+    while length <= 4 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 4:
+        raise ValueError("Invalid EBML element ID")
+    if offset + length > len(data):
+        raise ValueError("Truncated EBML element ID")
+    return int.from_bytes(data[offset:offset + length], 'big'), offset + length
+
+
+def read_ebml_size(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read an EBML data size, returning it and the offset after it."""
+    if offset >= len(data):
+        raise ValueError("Truncated EBML size")
+    first = data[offset]
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML size")
+    if offset + length > len(data):
+        raise ValueError("Truncated EBML size")
+
+    value = first & (0xFF >> length)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+
+    # An all-ones size means the size is unknown; treat it as extending to the end
+    if value == (1 << (7 * length)) - 1:
+        value = len(data)
+
+    return value, offset + length
+
+
+class TitleParser(HTMLParser):
+    """HTML parser that records the document title and stops after it."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_title = False
+        self.title_parts = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title':
+            self.in_title = True
+        elif tag == 'body':
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self.in_title:
+            self.in_title = False
+            self.done = True
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title_parts.append(data)
+
+
+@register_analyzer('html')
+def analyze_html(path: Path) -> Dict:
+    """
+    Extract the title of an HTML document.
+
+    The file is parsed incrementally and reading stops at the end of the
+    title, the end of the head, or after a fixed number of bytes.
+
+    Args:
+        path (Path): Path to the HTML file.
+
+    Returns:
+        Dict: ``title`` where found.
+    """
+    parser = TitleParser()
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        read = 0
+        while not parser.done and read < HTML_READ_LIMIT:
+            chunk = f.read(8192)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            read += len(chunk)
+
+    title = ' '.join(''.join(parser.title_parts).split())
+    return {'title': title} if title else {}
@@ -0,0 +1,389 @@
+"""
+Archive input handling for SCORM-Maker.
+
+This module lets a ZIP or tar archive be used as the input instead of a
+directory. Content is discovered from the archive index, and members are
+copied into the SCORM package without extracting them to disk. Stored and
+deflated members of a ZIP input are copied as raw compressed data, so they
+are never inflated or deflated again. Other members are recompressed with
+deflate, which every LMS can read.
+"""
+
+import shutil
+import stat
+import struct
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Callable, List, Optional, Set
+
+# Layout of a ZIP local file header (see APPNOTE.TXT, section 4.3.7)
+LOCAL_HEADER_FORMAT = '<4s2B4HL2L2H'
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_FORMAT)
+LOCAL_HEADER_SIGNATURE = b'PK\003\004'
+
+# General purpose flag bits: the member is encrypted, and sizes and CRC
+# follow the data
+ENCRYPTED_FLAG = 0x01
+DATA_DESCRIPTOR_FLAG = 0x08
+
+# Compression methods that are copied as they are; every LMS and browser
+# unzipper reads these
+RAW_COPY_COMPRESSION = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+# Private ZipFile attributes used to write raw member data. They are checked
+# before use, and members are recompressed if the running Python lacks any.
+ZIPFILE_WRITE_INTERNALS = (
+    '_lock',
+    '_writing',
+    '_seekable',
+    '_writecheck',
+    '_didModify',
+    'fp',
+    'start_dir',
+    'filelist',
+    'NameToInfo',
+)
+
+# Chunk size used when copying member data
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    """Exception raised for archive input errors."""
+    pass
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Check whether a path is a ZIP or tar archive.
+
+    Args:
+        path (Path): The path to check.
+
+    Returns:
+        bool: True if the path is a file in a supported archive format.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return False
+
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def normalize_member_name(name: str) -> Optional[str]:
+    """
+    Normalize an archive member name to a path inside the package root.
+
+    Args:
+        name (str): The archive member name.
+
+    Returns:
+        Optional[str]: The name without leading './' components, or None for
+            absolute names and names with '..' components.
+    """
+    path = PurePosixPath(name.replace('\\', '/'))
+    if path.is_absolute() or '..' in path.parts:
+        return None
+
+    # PurePosixPath drops '.' components, so tar names like './a.html' become 'a.html'
+    return str(path)
+
+
+def list_archive_members(archive_path: Path) -> List[str]:
+    """
+    List the regular files in an archive.
+
+    For ZIP files only the central directory is read. Tar files have no
+    index, so their headers are read in a single pass.
+
+    Args:
+        archive_path (Path): Path to the archive.
+
+    Returns:
+        List[str]: Normalized member names, in archive order.
+
+    Raises:
+        ArchiveError: If the archive cannot be read.
+    """
+    try:
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path, 'r') as source:
+                names = [info.filename for info in source.infolist() if not info.is_dir()]
+        else:
+            with tarfile.open(archive_path, 'r:*') as source:
+                names = [member.name for member in source.getmembers() if member.isfile()]
+    except (zipfile.BadZipFile, tarfile.TarError, OSError) as e:
+        raise ArchiveError(f"Error reading archive '{archive_path}': {str(e)}")
+
+    normalized = (normalize_member_name(name) for name in names)
+    return [name for name in normalized if name is not None]
+
+
+def copy_archive_members(
+    archive_path: Path,
+    zipf: zipfile.ZipFile,
+    exclude: Optional[Set[str]] = None,
+    on_copy: Optional[Callable[[zipfile.ZipInfo], None]] = None
+) -> List[str]:
+    """
+    Copy the members of an input archive into a SCORM package.
+
+    Args:
+        archive_path (Path): Path to the input archive.
+        zipf (zipfile.ZipFile): The package being written.
+        exclude (Set[str], optional): Normalized member names to skip, such
+            as files generated by SCORM-Maker that replace input files.
+        on_copy (Callable[[zipfile.ZipInfo], None], optional): Called with
+            the new entry after each member is copied.
+
+    Returns:
+        List[str]: Normalized names of the members that were copied.
+
+    Raises:
+        ArchiveError: If the archive cannot be read.
+    """
+    exclude = exclude or set()
+
+    try:
+        if zipfile.is_zipfile(archive_path):
+            return copy_zip_members(archive_path, zipf, exclude, on_copy)
+        return copy_tar_members(archive_path, zipf, exclude, on_copy)
+    except (zipfile.BadZipFile, tarfile.TarError, struct.error, NotImplementedError) as e:
+        raise ArchiveError(f"Error copying from archive '{archive_path}': {str(e)}")
+
+
+def copy_zip_members(
+    archive_path: Path,
+    zipf: zipfile.ZipFile,
+    exclude: Set[str],
+    on_copy: Optional[Callable[[zipfile.ZipInfo], None]] = None
+) -> List[str]:
+    """
+    Copy members of a ZIP file into a SCORM package.
+
+    Stored and deflated members are copied as raw compressed data when the
+    running Python's ZipFile supports it. Members using other compression
+    methods, such as bzip2 or LZMA, are decompressed and deflated again.
+
+    Args:
+        archive_path (Path): Path to the input ZIP file.
+        zipf (zipfile.ZipFile): The package being written.
+        exclude (Set[str]): Normalized member names to skip.
+        on_copy (Callable[[zipfile.ZipInfo], None], optional): Called with
+            the new entry after each member is copied.
+
+    Returns:
+        List[str]: Names of the members that were copied.
+
+    Raises:
+        ArchiveError: If a member is encrypted.
+    """
+    copied = []
+    raw_supported = supports_raw_copy(zipf)
+
+    with zipfile.ZipFile(archive_path, 'r') as source, open(archive_path, 'rb') as raw:
+        for info in source.infolist():
+            name = normalize_member_name(info.filename)
+            if info.is_dir() or name is None or name in exclude:
+                continue
+
+            if info.flag_bits & ENCRYPTED_FLAG:
+                raise ArchiveError(f"Member '{info.filename}' is encrypted")
+
+            if raw_supported and info.compress_type in RAW_COPY_COMPRESSION:
+                # The data starts after the local header, whose name and extra
+                # field lengths may differ from the central directory's
+                raw.seek(info.header_offset)
+                header = struct.unpack(LOCAL_HEADER_FORMAT, raw.read(LOCAL_HEADER_SIZE))
+                if header[0] != LOCAL_HEADER_SIGNATURE:
+                    raise ArchiveError(f"Bad local header for member '{info.filename}'")
+                raw.seek(info.header_offset + LOCAL_HEADER_SIZE + header[10] + header[11])
+
+                copied_info = write_raw_member(zipf, info, raw, arcname=name)
+            else:
+                copied_info = recompress_member(zipf, source, info, arcname=name)
+
+            copied.append(name)
+            if on_copy is not None:
+                on_copy(copied_info)
+
+    return copied
+
+
+def supports_raw_copy(zipf: zipfile.ZipFile) -> bool:
+    """
+    Check whether raw member data can be written to a ZIP file.
+
+    Args:
+        zipf (zipfile.ZipFile): The ZIP file being written.
+
+    Returns:
+        bool: True if the ZipFile has the private attributes that
+            write_raw_member relies on.
+    """
+    return all(hasattr(zipf, attribute) for attribute in ZIPFILE_WRITE_INTERNALS)
+
+
+def recompress_member(
+    zipf: zipfile.ZipFile,
+    source: zipfile.ZipFile,
+    source_info: zipfile.ZipInfo,
+    arcname: Optional[str] = None
+) -> zipfile.ZipInfo:
+    """
+    Decompress a member of a ZIP file and write it with the package's compression.
+
+    The member is streamed, so it is never held in memory or written to disk.
+
+    Args:
+        zipf (zipfile.ZipFile): The ZIP file being written.
+        source (zipfile.ZipFile): The ZIP file being read.
+        source_info (zipfile.ZipInfo): The member to copy.
+        arcname (str, optional): Name for the member in the new archive.
+            Defaults to the source name.
+
+    Returns:
+        zipfile.ZipInfo: The entry written to the new archive.
+    """
+    info = zipfile.ZipInfo(arcname or source_info.filename, source_info.date_time)
+    info.compress_type = zipf.compression
+    info.file_size = source_info.file_size
+    info.external_attr = source_info.external_attr
+    info.comment = source_info.comment
+
+    with source.open(source_info) as src, zipf.open(info, 'w') as dest:
+        shutil.copyfileobj(src, dest, COPY_CHUNK_SIZE)
+
+    return info
+
+
+def write_raw_member(zipf: zipfile.ZipFile, source_info: zipfile.ZipInfo, data, arcname: Optional[str] = None) -> zipfile.ZipInfo:
+    """
+    Write already-compressed member data into a ZIP file.
+
+    The standard library has no public API for this, so the member is added
+    the same way ``ZipFile.mkdir`` adds entries: the local header is written
+    at the end of the archive and the entry is registered for the central
+    directory. Callers must check supports_raw_copy first, and only copy
+    members that are stored or deflated and not encrypted.
+
+    Args:
+        zipf (zipfile.ZipFile): The ZIP file being written.
+        source_info (zipfile.ZipInfo): Metadata of the member being copied,
+            including its CRC and sizes.
+        data: Binary file object positioned at the start of the compressed data.
+        arcname (str, optional): Name for the member in the new archive.
+            Defaults to the source name.
+
+    Returns:
+        zipfile.ZipInfo: The entry written to the new archive.
+    """
+    info = zipfile.ZipInfo(arcname or source_info.filename, source_info.date_time)
+    info.compress_type = source_info.compress_type
+    info.flag_bits = source_info.flag_bits & ~DATA_DESCRIPTOR_FLAG
+    info.CRC = source_info.CRC
+    info.compress_size = source_info.compress_size
+    info.file_size = source_info.file_size
+    info.external_attr = source_info.external_attr
+    info.create_system = source_info.create_system
+    info.comment = source_info.comment
+
+    zip64 = (
+        info.file_size > zipfile.ZIP64_LIMIT
+        or info.compress_size > zipfile.ZIP64_LIMIT
+    )
+
+    with zipf._lock:
+        if zipf._writing:
+            raise ValueError("Can't write to ZIP archive while an open writing handle exists")
+
+        if zipf._seekable:
+            zipf.fp.seek(zipf.start_dir)
+        info.header_offset = zipf.fp.tell()
+
+        zipf._writecheck(info)
+        zipf._didModify = True
+
+        zipf.fp.write(info.FileHeader(zip64))
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = data.read(min(COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise ArchiveError(f"Unexpected end of data for member '{info.filename}'")
+            zipf.fp.write(chunk)
+            remaining -= len(chunk)
+
+        zipf.filelist.append(info)
+        zipf.NameToInfo[info.filename] = info
+        zipf.start_dir = zipf.fp.tell()
+
+    return info
+
+
+def copy_tar_members(
+    archive_path: Path,
+    zipf: zipfile.ZipFile,
+    exclude: Set[str],
+    on_copy: Optional[Callable[[zipfile.ZipInfo], None]] = None
+) -> List[str]:
+    """
+    Stream members of a tar file into a ZIP file.
+
+    Tar members are not stored in ZIP's compressed format, so they have to
+    be compressed, but they are read in a single sequential pass and never
+    written to disk.
+
+    Args:
+        archive_path (Path): Path to the input tar file.
+        zipf (zipfile.ZipFile): The package being written.
+        exclude (Set[str]): Normalized member names to skip.
+        on_copy (Callable[[zipfile.ZipInfo], None], optional): Called with
+            the new entry after each member is copied.
+
+    Returns:
+        List[str]: Names of the members that were copied.
+    """
+    copied = []
+
+    with tarfile.open(archive_path, 'r|*') as source:
+        for member in source:
+            name = normalize_member_name(member.name)
+            if not member.isfile() or name is None or name in exclude:
+                continue
+
+            info = tar_member_zipinfo(member, name)
+            info.compress_type = zipf.compression
+
+            with source.extractfile(member) as src, zipf.open(info, 'w') as dest:
+                shutil.copyfileobj(src, dest, COPY_CHUNK_SIZE)
+
+            copied.append(name)
+            if on_copy is not None:
+                on_copy(info)
+
+    return copied
+
+
+def tar_member_zipinfo(member: tarfile.TarInfo, arcname: str) -> zipfile.ZipInfo:
+    """
+    Create ZIP metadata for a tar member.
+
+    Args:
+        member (tarfile.TarInfo): The tar member.
+        arcname (str): Name for the member in the ZIP file.
+
+    Returns:
+        zipfile.ZipInfo: ZIP metadata with the member's name, time and mode.
+    """
+    # ZIP timestamps cannot represent dates before 1980
+    date_time = time.localtime(max(member.mtime, 315532800))[:6]
+
+    info = zipfile.ZipInfo(arcname, date_time)
+    info.file_size = member.size
+    info.external_attr = (stat.S_IFREG | (member.mode & 0o7777)) << 16
+
+    return info
+
@@ -0,0 +1,329 @@
+"""
+Content-hashed asset names for SCORM-Maker.
+
+This module renames packaged assets to names that include a hash of their
+content, such as ``video.3f2a9c1e.mp4``, and rewrites the references to them
+in HTML and CSS files. An asset that does not change between two versions
+of a course keeps the same URL, so browsers and CDNs can cache it
+indefinitely. HTML pages keep their names, since they are the entry points
+that the LMS and other pages link to.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from .analyzers import get_stat_key, prune_stat_keys
+from .utils import get_cache_dir
+
+# Number of hex digits of the content hash used in names
+HASH_LENGTH = 8
+
+# Chunk size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+HASH_CACHE_FILE = 'asset_hashes.json'
+
+# Pages that keep their names
+HTML_EXTENSIONS = ('.html', '.htm')
+
+# URL-valued HTML attributes, and CSS url() values and @import strings
+HTML_REFERENCE_PATTERN = re.compile(r'''(\b(?:src|href|poster|data)\s*=\s*)(["'])(.*?)\2''', re.IGNORECASE)
+CSS_URL_PATTERN = re.compile(r'''(url\(\s*)(["']?)(.*?)\2(\s*\))''', re.IGNORECASE)
+CSS_IMPORT_PATTERN = re.compile(r'''(@import\s+)(["'])(.*?)\2''', re.IGNORECASE)
+
+# URLs with a scheme (http:, data:, mailto: ...) do not refer to package files
+URL_SCHEME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+
+
+def get_hashed_name(rel_path: str, digest: str) -> str:
+    """
+    Insert a content hash into a file name.
+
+    Args:
+        rel_path (str): POSIX path of the file, e.g. 'media/intro.mp4'.
+        digest (str): Hex digest of the file content.
+
+    Returns:
+        str: The path with the hash before the extension, e.g.
+            'media/intro.3f2a9c1e.mp4'.
+    """
+    path = PurePosixPath(rel_path)
+    return str(path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"))
+
+
+def hash_file(path: Path, cache: Dict[str, str]) -> str:
+    """
+    Hash the content of a file, reusing the cached hash if it is unchanged.
+
+    Args:
+        path (Path): Path to the file.
+        cache (Dict[str, str]): Hashes keyed by path, size and modification time.
+
+    Returns:
+        str: Hex SHA-256 digest of the file.
+    """
+    stat_key = get_stat_key(path)
+    if stat_key in cache:
+        return cache[stat_key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    cache[stat_key] = digest.hexdigest()
+    return cache[stat_key]
+
+
+def resolve_reference(base_dir: PurePosixPath, url: str) -> Optional[str]:
+    """
+    Resolve a relative URL to the package path it refers to.
+
+    Args:
+        base_dir (PurePosixPath): Directory of the referring file.
+        url (str): The URL as written.
+
+    Returns:
+        Optional[str]: The package path, or None for absolute URLs, fragments
+            and paths outside the package.
+    """
+    path = re.split(r'[?#]', url.strip(), maxsplit=1)[0]
+    if not path or path.startswith('/') or URL_SCHEME_PATTERN.match(path):
+        return None
+
+    resolved = os.path.normpath(str(base_dir / unquote(path))).replace(os.sep, '/')
+    if resolved == '..' or resolved.startswith('../'):
+        return None
+
+    return resolved
+
+
+def rewrite_references(
+    text: str,
+    patterns: Iterable[re.Pattern],
+    base_dir: PurePosixPath,
+    names: Dict[str, str]
+) -> str:
+    """
+    Point references in HTML or CSS text at hashed names.
+
+    Hashed files stay in the same directory, so only the file name part of
+    each URL is changed, keeping any query string, fragment or escaping.
+
+    Args:
+        text (str): The HTML or CSS text.
+        patterns (Iterable[re.Pattern]): Patterns whose third group is a URL.
+        base_dir (PurePosixPath): Directory of the file the text belongs to.
+        names (Dict[str, str]): Hashed names keyed by original package path.
+
+    Returns:
+        str: The rewritten text.
+    """
+    def replace(match):
+        url = match.group(3)
+        target = resolve_reference(base_dir, url)
+        if target not in names:
+            return match.group(0)
+
+        path_end = len(re.split(r'[?#]', url, maxsplit=1)[0])
+        path, rest = url[:path_end], url[path_end:]
+
+        # Insert the hash before the extension as written in the URL
+        suffix = PurePosixPath(target).suffix
+        hash_part = PurePosixPath(names[target]).suffixes[-2 if suffix else -1]
+        if suffix:
+            if not path.endswith(suffix):
+                return match.group(0)
+            path = path[:-len(suffix)] + hash_part + suffix
+        else:
+            path = path + hash_part
+
+        start = match.start(3) - match.start(0)
+        end = match.end(3) - match.start(0)
+        return match.group(0)[:start] + path + rest + match.group(0)[end:]
+
+    for pattern in patterns:
+        text = pattern.sub(replace, text)
+
+    return text
+
+
+def find_references(text: str, patterns: Iterable[re.Pattern], base_dir: PurePosixPath) -> Set[str]:
+    """
+    Find the package paths referenced from HTML or CSS text.
+
+    Args:
+        text (str): The HTML or CSS text.
+        patterns (Iterable[re.Pattern]): Patterns whose third group is a URL.
+        base_dir (PurePosixPath): Directory of the file the text belongs to.
+
+    Returns:
+        Set[str]: Referenced package paths.
+    """
+    references = set()
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            target = resolve_reference(base_dir, match.group(3))
+            if target is not None:
+                references.add(target)
+    return references
+
+
+def hash_input_assets(
+    files: List[Tuple[Path, str]],
+    content_items: List[Dict],
+    package_dir: Path,
+    config: Dict
+) -> Dict[str, str]:
+    """
+    Choose hashed names for input files and rewrite references to them.
+
+    Non-HTML content items and files referenced from HTML or CSS files are
+    renamed. Files only referenced from scripts keep their names, since the
+    URLs scripts build cannot be rewritten. CSS files imported by other CSS
+    files also keep their names. HTML and CSS files whose references change
+    are written to the staging directory, where they take the place of the
+    input files.
+
+    Args:
+        files (List[Tuple[Path, str]]): Input files and their package paths.
+        content_items (List[Dict]): List of processed content items.
+        package_dir (Path): Staging directory for generated files.
+        config (Dict): Configuration dictionary.
+
+    Returns:
+        Dict[str, str]: Hashed names keyed by original package path.
+    """
+    cache_path = get_cache_dir(config) / HASH_CACHE_FILE
+    cache = load_hash_cache(cache_path)
+
+    paths = {name: path for path, name in files}
+    texts = {}
+    for path, name in files:
+        if name.lower().endswith(HTML_EXTENSIONS + ('.css',)):
+            with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as f:
+                texts[name] = f.read()
+
+    def patterns_for(name):
+        if name.lower().endswith('.css'):
+            return (CSS_URL_PATTERN, CSS_IMPORT_PATTERN)
+        return (HTML_REFERENCE_PATTERN, CSS_URL_PATTERN)
+
+    # Everything referenced from a page or a style sheet, plus the content items
+    referenced = {
+        Path(item['rel_path']).as_posix()
+        for item in content_items
+    }
+    imported_css = set()
+    for name, text in texts.items():
+        base_dir = PurePosixPath(name).parent
+        references = find_references(text, patterns_for(name), base_dir)
+        referenced |= references
+        if name.lower().endswith('.css'):
+            imported_css |= {reference for reference in references if reference.lower().endswith('.css')}
+
+    renamed = {
+        name for name in referenced
+        if name in paths
+        and not name.lower().endswith(HTML_EXTENSIONS)
+        and name not in imported_css
+    }
+
+    # Files whose content does not depend on other names are hashed first
+    names = {}
+    for name in renamed:
+        if name not in texts:
+            names[name] = get_hashed_name(name, hash_file(paths[name], cache))
+
+    # Style sheets are hashed after their references are rewritten, so a
+    # changed image also changes the name of the style sheet that uses it.
+    # Imported style sheets keep their names, so they can be rewritten first.
+    css_names = sorted(name for name in texts if name.lower().endswith('.css'))
+    for name in sorted(css_names, key=lambda css_name: css_name in renamed):
+        text = rewrite_references(texts[name], patterns_for(name), PurePosixPath(name).parent, names)
+        if name in renamed:
+            data = text.encode('utf-8', errors='surrogateescape')
+            names[name] = get_hashed_name(name, hashlib.sha256(data).hexdigest())
+        if text != texts[name] or name in renamed:
+            write_staged_text(package_dir / names.get(name, name), text)
+
+    for name, text in texts.items():
+        if name.lower().endswith(HTML_EXTENSIONS):
+            rewritten = rewrite_references(text, patterns_for(name), PurePosixPath(name).parent, names)
+            if rewritten != text:
+                write_staged_text(package_dir / name, rewritten)
+
+    # Keep the cache from growing with every file ever hashed
+    prune_stat_keys(cache)
+    save_hash_cache(cache_path, cache)
+
+    return names
+
+
+def hash_generated_files(package_dir: Path, names: List[str]) -> Dict[str, str]:
+    """
+    Rename generated files in the staging directory to hashed names.
+
+    Args:
+        package_dir (Path): Staging directory for generated files.
+        names (List[str]): Package paths of the files to rename.
+
+    Returns:
+        Dict[str, str]: Hashed names keyed by original package path.
+    """
+    hashed = {}
+    for name in names:
+        path = package_dir / name
+        with open(path, 'rb') as f:
+            hashed[name] = get_hashed_name(name, hashlib.sha256(f.read()).hexdigest())
+        os.replace(path, package_dir / hashed[name])
+
+    return hashed
+
+
+def write_staged_text(path: Path, text: str) -> None:
+    """Write rewritten text to the staging directory, keeping undecodable bytes."""
+    os.makedirs(path.parent, exist_ok=True)
+    with open(path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as f:
+        f.write(text)
+
+
+def load_hash_cache(cache_path: Path) -> Dict[str, str]:
+    """
+    Load the cache of file hashes.
+
+    Args:
+        cache_path (Path): Path to the cache file.
+
+    Returns:
+        Dict[str, str]: Hashes keyed by path, size and modification time.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hash_cache(cache_path: Path, cache: Dict[str, str]) -> None:
+    """
+    Save the cache of file hashes.
+
+    Args:
+        cache_path (Path): Path to the cache file.
+        cache (Dict[str, str]): Hashes keyed by path, size and modification time.
+    """
+    try:
+        os.makedirs(cache_path.parent, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is an optimization; a read-only cache is not an error
+        pass
@@ -7,14 +7,19 @@ for the SCORM-Maker tool.
 """
 
 import argparse
+import json
 import os
 import sys
 from pathlib import Path
 
 from . import __version__
+from .analyzers import analyze_content
+from .archive import is_archive
 from .config import load_config
 from .content_processor import process_content
+from .planner import format_plan, plan_package
 from .scorm_generator import generate_scorm_package
+from .verifier import verify_packages
 
 
 def parse_args():
@@ -26,7 +31,7 @@ def parse_args():
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Path to the directory containing content files"
+        help="Path to the directory, ZIP file or tar file containing content files"
     )
     
     parser.add_argument(
@@ -41,6 +46,12 @@ def parse_args():
         help="Path to the configuration file (default: scorm_config.yaml)"
     )
     
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted build of the same package instead of starting again"
+    )
+    
     parser.add_argument(
         "--version", "-v",
         action="version",
@@ -50,14 +61,159 @@ def parse_args():
     return parser.parse_args()
 
 
+def positive_int(value):
+    """Parse a command-line value that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got '{value}'")
+    
+    return number
+
+
+def parse_verify_args(argv):
+    """Parse command-line arguments for the verify command."""
+    parser = argparse.ArgumentParser(
+        prog="scorm-maker verify",
+        description="Verify existing SCORM packages without extracting them"
+    )
+    
+    parser.add_argument(
+        "packages",
+        nargs="+",
+        help="SCORM package files, or directories containing packages"
+    )
+    
+    parser.add_argument(
+        "--check-crc",
+        action="store_true",
+        help="Decompress every member and check its CRC"
+    )
+    
+    parser.add_argument(
+        "--workers", "-w",
+        type=positive_int,
+        default=None,
+        help="Number of threads used to verify packages and check CRCs"
+    )
+    
+    return parser.parse_args(argv)
+
+
+def verify_main(argv):
+    """Entry point for the verify command."""
+    args = parse_verify_args(argv)
+    
+    for package in args.packages:
+        if not Path(package).exists():
+            print(f"Error: Package path '{package}' does not exist")
+            sys.exit(1)
+    
+    reports = verify_packages(
+        [Path(package) for package in args.packages],
+        check_crc=args.check_crc,
+        workers=args.workers
+    )
+    
+    print(json.dumps(reports, indent=2))
+    
+    if not all(report['valid'] for report in reports):
+        sys.exit(1)
+
+
+def parse_plan_args(argv):
+    """Parse command-line arguments for the plan command."""
+    parser = argparse.ArgumentParser(
+        prog="scorm-maker plan",
+        description="Estimate package size and build time without building the package"
+    )
+    
+    parser.add_argument(
+        "--input", "-i",
+        required=True,
+        help="Path to the directory, ZIP file or tar file containing content files"
+    )
+    
+    parser.add_argument(
+        "--config", "-c",
+        default="scorm_config.yaml",
+        help="Path to the configuration file (default: scorm_config.yaml)"
+    )
+    
+    parser.add_argument(
+        "--format", "-f",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)"
+    )
+    
+    parser.add_argument(
+        "--max-size",
+        type=float,
+        default=None,
+        help="Package size limit in megabytes; exit with status 1 if the estimate exceeds it"
+    )
+    
+    parser.add_argument(
+        "--no-sample",
+        action="store_true",
+        help="Use default compression ratios instead of sampling files"
+    )
+    
+    return parser.parse_args(argv)
+
+
+def plan_main(argv):
+    """Entry point for the plan command."""
+    args = parse_plan_args(argv)
+    
+    input_path = Path(args.input)
+    if not input_path.exists() or not (input_path.is_dir() or is_archive(input_path)):
+        print(f"Error: Input '{args.input}' does not exist or is not a directory or archive")
+        sys.exit(1)
+    
+    config_file = Path(args.config)
+    if not config_file.exists() or not config_file.is_file():
+        print(f"Error: Configuration file '{args.config}' does not exist or is not a file")
+        sys.exit(1)
+    
+    max_size = int(args.max_size * 1024 * 1024) if args.max_size is not None else None
+    
+    try:
+        config = load_config(config_file)
+        plan = plan_package(input_path, config, sample=not args.no_sample, max_size=max_size)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    
+    if args.format == "json":
+        print(json.dumps(plan, indent=2))
+    else:
+        print(format_plan(plan))
+    
+    if plan['exceeds_max_size']:
+        sys.exit(1)
+
+
 def main():
     """Main entry point for the SCORM-Maker CLI."""
+    if sys.argv[1:2] == ["verify"]:
+        verify_main(sys.argv[2:])
+        return
+    
+    if sys.argv[1:2] == ["plan"]:
+        plan_main(sys.argv[2:])
+        return
+    
     args = parse_args()
     
-    # Validate input directory
+    # Validate input directory or archive
     input_dir = Path(args.input)
-    if not input_dir.exists() or not input_dir.is_dir():
-        print(f"Error: Input directory '{args.input}' does not exist or is not a directory")
+    if not input_dir.exists() or not (input_dir.is_dir() or is_archive(input_dir)):
+        print(f"Error: Input '{args.input}' does not exist or is not a directory or archive")
         sys.exit(1)
     
     # Validate output directory
@@ -82,11 +238,15 @@ def main():
         # Process content
         processed_content = process_content(input_dir, config)
         
+        # Extract metadata such as titles, page counts and durations
+        analyze_content(processed_content, config)
+        
         # Generate SCORM package
         package_path = generate_scorm_package(
             processed_content,
             output_dir,
-            config
+            config,
+            resume=args.resume
         )
         
         print(f"SCORM package successfully generated at: {package_path}")
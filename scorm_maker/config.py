@@ -118,6 +118,27 @@ def validate_config(config):
     if not isinstance(ui, dict):
         raise ConfigError("'ui' section must be a dictionary")
     
+    if 'pdf_completion_percentage' in ui:
+        percentage = ui['pdf_completion_percentage']
+        if not isinstance(percentage, (int, float)) or isinstance(percentage, bool):
+            raise ConfigError("'ui.pdf_completion_percentage' must be a number")
+        
+        if percentage < 0 or percentage > 100:
+            raise ConfigError("'ui.pdf_completion_percentage' must be between 0 and 100")
+    
+    for field in ['pdfjs_url', 'pdfjs_worker_url']:
+        if field in ui and not isinstance(ui[field], str):
+            raise ConfigError(f"'ui.{field}' must be a string")
+    
+    # Validate packaging mode
+    valid_packaging_modes = ['single_sco', 'multi_sco']
+    if config.get('packaging', 'single_sco') not in valid_packaging_modes:
+        raise ConfigError(f"Invalid 'packaging'. Must be one of: {', '.join(valid_packaging_modes)}")
+    
+    # Validate build options
+    if 'build' in config:
+        validate_build_config(config['build'])
+    
     # Validate content items
     if 'content_items' not in config:
         raise ConfigError("Missing 'content_items' section in configuration")
@@ -138,3 +159,30 @@ def validate_config(config):
         
         if 'title' not in item:
             raise ConfigError(f"Content item at index {i} is missing required field 'title'")
+
+
+
+def validate_build_config(build):
+    """
+    Validate the optional 'build' section of the configuration.
+    
+    Args:
+        build (dict): The 'build' section to validate.
+        
+    Raises:
+        ConfigError: If the section is invalid.
+    """
+    if not isinstance(build, dict):
+        raise ConfigError("'build' section must be a dictionary")
+    
+    for field in ['minify', 'analyze_content', 'hash_asset_names']:
+        if field in build and not isinstance(build[field], bool):
+            raise ConfigError(f"'build.{field}' must be true or false")
+    
+    if 'cache_dir' in build and not isinstance(build['cache_dir'], str):
+        raise ConfigError("'build.cache_dir' must be a string")
+    
+    if 'analyzer_workers' in build:
+        workers = build['analyzer_workers']
+        if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+            raise ConfigError("'build.analyzer_workers' must be a positive integer")
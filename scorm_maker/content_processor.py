@@ -8,7 +8,9 @@ import os
 import re
 import shutil
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from .archive import ArchiveError, is_archive, list_archive_members
 
 # Supported file extensions and their corresponding MIME types
 SUPPORTED_EXTENSIONS = {
@@ -35,8 +37,13 @@ def process_content(input_dir: Path, config: Dict) -> List[Dict]:
     """
     Process content files from the input directory.
     
+    The input may also be a ZIP or tar archive, in which case content is
+    discovered from the archive index without extracting it. Items from an
+    archive have no ``file_path``; instead ``archive_path`` names the archive
+    and ``rel_path`` the member.
+    
     Args:
-        input_dir (Path): Path to the directory containing content files.
+        input_dir (Path): Path to the directory or archive containing content files.
         config (Dict): Configuration dictionary.
         
     Returns:
@@ -51,6 +58,9 @@ def process_content(input_dir: Path, config: Dict) -> List[Dict]:
     # Create a mapping of filenames to config items
     config_item_map = {item['file']: item for item in config_items}
     
+    if is_archive(input_dir):
+        return process_archive_content(input_dir, config_item_map)
+    
     # Find all content files in the input directory
     content_files = []
     for ext in SUPPORTED_EXTENSIONS.keys():
@@ -64,37 +74,7 @@ def process_content(input_dir: Path, config: Dict) -> List[Dict]:
     for file_path in content_files:
         # Get the relative path from the input directory
         rel_path = file_path.relative_to(input_dir)
-        file_name = str(rel_path)
-        
-        # Check if this file is in the config
-        if file_name in config_item_map:
-            # Use the config item
-            item_config = config_item_map[file_name]
-            title = item_config.get('title', file_name)
-            description = item_config.get('description', '')
-            required = item_config.get('required', True)
-        else:
-            # Create a default item
-            title = get_title_from_filename(file_name)
-            description = ''
-            required = True
-        
-        # Get the file extension and MIME type
-        ext = file_path.suffix.lower()
-        mime_type = SUPPORTED_EXTENSIONS.get(ext, 'application/octet-stream')
-        
-        # Create the processed item
-        processed_item = {
-            'file_path': file_path,
-            'rel_path': rel_path,
-            'title': title,
-            'description': description,
-            'required': required,
-            'mime_type': mime_type,
-            'type': get_content_type(ext),
-        }
-        
-        processed_items.append(processed_item)
+        processed_items.append(create_content_item(rel_path, config_item_map, file_path=file_path))
     
     # Sort the processed items
     processed_items = sort_content_items(processed_items)
@@ -102,6 +82,92 @@ def process_content(input_dir: Path, config: Dict) -> List[Dict]:
     return processed_items
 
 
+def process_archive_content(archive_path: Path, config_item_map: Dict[str, Dict]) -> List[Dict]:
+    """
+    Process content files from a ZIP or tar archive.
+    
+    Args:
+        archive_path (Path): Path to the archive containing content files.
+        config_item_map (Dict[str, Dict]): Config items keyed by file name.
+        
+    Returns:
+        List[Dict]: List of processed content items.
+        
+    Raises:
+        ContentProcessingError: If there are issues processing the content.
+    """
+    try:
+        member_names = list_archive_members(archive_path)
+    except ArchiveError as e:
+        raise ContentProcessingError(str(e))
+    
+    # Match members the same way the directory glob matches files
+    processed_items = [
+        create_content_item(Path(name), config_item_map, archive_path=archive_path)
+        for name in member_names
+        if os.path.splitext(name)[1] in SUPPORTED_EXTENSIONS
+    ]
+    
+    if not processed_items:
+        raise ContentProcessingError(f"No supported content files found in {archive_path}")
+    
+    return sort_content_items(processed_items)
+
+
+def create_content_item(
+    rel_path: Path,
+    config_item_map: Dict[str, Dict],
+    file_path: Optional[Path] = None,
+    archive_path: Optional[Path] = None
+) -> Dict:
+    """
+    Create a processed content item for a content file.
+    
+    Args:
+        rel_path (Path): Path of the file relative to the input root.
+        config_item_map (Dict[str, Dict]): Config items keyed by file name.
+        file_path (Path, optional): Path of the file on disk.
+        archive_path (Path, optional): Path of the archive containing the file.
+        
+    Returns:
+        Dict: The processed content item.
+    """
+    file_name = str(rel_path)
+    
+    # Check if this file is in the config
+    if file_name in config_item_map:
+        # Use the config item
+        item_config = config_item_map[file_name]
+        title = item_config.get('title', file_name)
+        description = item_config.get('description', '')
+        required = item_config.get('required', True)
+    else:
+        # Create a default item
+        title = get_title_from_filename(file_name)
+        description = ''
+        required = True
+    
+    # Get the file extension and MIME type
+    ext = rel_path.suffix.lower()
+    mime_type = SUPPORTED_EXTENSIONS.get(ext, 'application/octet-stream')
+    
+    # Create the processed item
+    processed_item = {
+        'file_path': file_path,
+        'rel_path': rel_path,
+        'title': title,
+        'description': description,
+        'required': required,
+        'mime_type': mime_type,
+        'type': get_content_type(ext),
+    }
+    
+    if archive_path is not None:
+        processed_item['archive_path'] = archive_path
+    
+    return processed_item
+
+
 def get_title_from_filename(filename: str) -> str:
     """
     Generate a title from a filename.
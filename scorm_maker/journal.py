@@ -0,0 +1,276 @@
+"""
+Checkpoint journal for resumable SCORM package builds.
+
+While a package is written to ``<package>.zip.partial``, every completed
+member is recorded in ``<package>.zip.journal``: its offsets, CRC and sizes,
+and the size and modification time of the file it was read from. Entries are
+only journaled after the member data has been flushed to disk, so a build
+that is interrupted can be resumed by truncating the partial file after the
+last journaled member that is still valid and carrying on from there.
+
+The journal is a JSON Lines file. The first line is a header identifying the
+build; each following line describes one member.
+"""
+
+import json
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .archive import LOCAL_HEADER_FORMAT, LOCAL_HEADER_SIGNATURE, LOCAL_HEADER_SIZE
+
+# Bump this whenever the journal format changes; older journals are ignored
+JOURNAL_VERSION = 1
+
+# A checkpoint is written after this many bytes or members, whichever comes first
+CHECKPOINT_BYTES = 64 * 1024 * 1024
+CHECKPOINT_MEMBERS = 1000
+
+
+class JournalError(Exception):
+    """Exception raised for checkpoint journal errors."""
+    pass
+
+
+def get_partial_path(zip_path: Path) -> Path:
+    """Get the path a package is written to before it is complete."""
+    return zip_path.with_name(f"{zip_path.name}.partial")
+
+
+def get_journal_path(zip_path: Path) -> Path:
+    """Get the path of the checkpoint journal for a package."""
+    return zip_path.with_name(f"{zip_path.name}.journal")
+
+
+def get_lock_path(zip_path: Path) -> Path:
+    """Get the path of the advisory lock file for a package."""
+    return zip_path.with_name(f"{zip_path.name}.lock")
+
+
+def get_source_signature(path: Path) -> Dict:
+    """
+    Get the size and modification time of a source file.
+
+    Args:
+        path (Path): Path to the source file.
+
+    Returns:
+        Dict: ``source_size`` and ``source_mtime_ns``.
+    """
+    stat = os.stat(path)
+    return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+
+class JournalWriter:
+    """
+    Records completed members of a package being written.
+
+    Entries are held in memory until the next checkpoint, when the package
+    file is flushed and synced first and the entries are appended to the
+    journal after it. A journaled member is therefore always on disk.
+    """
+
+    def __init__(self, journal_path: Path, package_fp, header: Dict, entries: Optional[List[Dict]] = None):
+        """
+        Start a new journal, or continue an existing one.
+
+        Args:
+            journal_path (Path): Path to the journal file.
+            package_fp: Binary file object the package is written to.
+            header (Dict): Values identifying the build.
+            entries (List[Dict], optional): Entries kept from a previous run.
+                The journal is rewritten with just these entries.
+        """
+        self.package_fp = package_fp
+        self.pending: List[Dict] = []
+        self.pending_bytes = 0
+        self.written_bytes = 0
+        self.checkpointed = len(entries or [])
+
+        self.journal = open(journal_path, 'w', encoding='utf-8')
+        self.journal.write(json.dumps(dict(header, version=JOURNAL_VERSION)) + '\n')
+        for entry in entries or []:
+            self.journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def record(self, info: zipfile.ZipInfo, end_offset: int, source: Optional[Dict] = None) -> None:
+        """
+        Record a member that has been written.
+
+        Args:
+            info (zipfile.ZipInfo): The member's entry.
+            end_offset (int): Offset just past the member's data.
+            source (Dict, optional): Signature of the file the member was
+                read from, as returned by get_source_signature. Members
+                without one are generated files, which are never reused.
+        """
+        entry = {
+            'name': info.filename,
+            'header_offset': info.header_offset,
+            'end_offset': end_offset,
+            'crc': info.CRC,
+            'compress_size': info.compress_size,
+            'file_size': info.file_size,
+            'compress_type': info.compress_type,
+            'flag_bits': info.flag_bits,
+            'date_time': list(info.date_time),
+            'external_attr': info.external_attr,
+            'create_system': info.create_system,
+            'generated': source is None,
+        }
+        if source is not None:
+            entry.update(source)
+
+        self.pending.append(entry)
+        self.pending_bytes += info.compress_size
+        self.written_bytes += info.file_size
+
+        if self.pending_bytes >= CHECKPOINT_BYTES or len(self.pending) >= CHECKPOINT_MEMBERS:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Sync the package file and append pending entries to the journal."""
+        if not self.pending:
+            return
+
+        self.package_fp.flush()
+        os.fsync(self.package_fp.fileno())
+
+        for entry in self.pending:
+            self.journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+        self.checkpointed += len(self.pending)
+        self.pending = []
+        self.pending_bytes = 0
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self.journal.close()
+
+
+def load_journal(journal_path: Path, header: Dict) -> List[Dict]:
+    """
+    Read the entries of a journal.
+
+    Args:
+        journal_path (Path): Path to the journal file.
+        header (Dict): Values identifying the build being resumed.
+
+    Returns:
+        List[Dict]: The journaled entries, in the order they were written.
+
+    Raises:
+        JournalError: If the journal is missing or belongs to another build.
+    """
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        raise JournalError(f"Cannot read journal '{journal_path}': {str(e)}")
+
+    try:
+        journal_header = json.loads(lines[0]) if lines else {}
+    except ValueError:
+        journal_header = {}
+
+    if journal_header != dict(header, version=JOURNAL_VERSION):
+        raise JournalError(f"Journal '{journal_path}' does not match this build")
+
+    entries = []
+    for line in lines[1:]:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # A line cut short by a crash ends the usable journal
+            break
+
+    return entries
+
+
+def find_resume_point(
+    entries: List[Dict],
+    partial_path: Path,
+    get_source: Callable[[str], Optional[Path]]
+) -> List[Dict]:
+    """
+    Find the journaled members that can be kept when resuming a build.
+
+    Entries are checked in order, and the first one that fails a check ends
+    the list, since everything after it in the partial file is discarded.
+    A member is kept if it is contiguous with the previous one, its local
+    header is intact, and its source file has not changed. Generated files
+    are never kept because they are rendered again on every run.
+
+    Args:
+        entries (List[Dict]): Entries read from the journal.
+        partial_path (Path): Path to the partial package.
+        get_source (Callable[[str], Optional[Path]]): Returns the source
+            file for a member name, or None if the member is no longer
+            part of the package.
+
+    Returns:
+        List[Dict]: The entries to keep.
+    """
+    kept = []
+    offset = 0
+
+    try:
+        partial_size = os.path.getsize(partial_path)
+        with open(partial_path, 'rb') as f:
+            for entry in entries:
+                if entry.get('generated') or entry['header_offset'] != offset:
+                    break
+                if entry['end_offset'] > partial_size:
+                    break
+
+                source = get_source(entry['name'])
+                if source is None:
+                    break
+                try:
+                    if get_source_signature(source) != {
+                        'source_size': entry['source_size'],
+                        'source_mtime_ns': entry['source_mtime_ns'],
+                    }:
+                        break
+                except OSError:
+                    break
+
+                f.seek(entry['header_offset'])
+                header = struct.unpack(LOCAL_HEADER_FORMAT, f.read(LOCAL_HEADER_SIZE))
+                name = f.read(header[10])
+                if header[0] != LOCAL_HEADER_SIGNATURE or name != entry['name'].encode('utf-8'):
+                    break
+
+                kept.append(entry)
+                offset = entry['end_offset']
+    except (OSError, KeyError, struct.error):
+        pass
+
+    return kept
+
+
+def entry_to_zipinfo(entry: Dict) -> zipfile.ZipInfo:
+    """
+    Rebuild the central directory entry of a journaled member.
+
+    Args:
+        entry (Dict): A journal entry.
+
+    Returns:
+        zipfile.ZipInfo: The member's entry.
+    """
+    info = zipfile.ZipInfo(entry['name'], tuple(entry['date_time']))
+    info.header_offset = entry['header_offset']
+    info.CRC = entry['crc']
+    info.compress_size = entry['compress_size']
+    info.file_size = entry['file_size']
+    info.compress_type = entry['compress_type']
+    info.flag_bits = entry['flag_bits']
+    info.external_attr = entry['external_attr']
+    info.create_system = entry['create_system']
+    return info
@@ -0,0 +1,448 @@
+"""
+Minification of generated runtime assets for SCORM-Maker.
+
+This module provides conservative minifiers for the HTML, CSS and JavaScript
+produced from the templates. They remove comments and indentation but keep
+line breaks, so they never have to reason about automatic semicolon insertion.
+Results are cached on disk by content hash, and the least recently used
+cache entries are pruned so the cache stays bounded.
+"""
+
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+# Bump this whenever the minifier output changes so stale cache entries are ignored
+MINIFIER_VERSION = '2'
+
+# Characters after which a '/' starts a regular expression rather than a division
+REGEX_PREFIX_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+
+# Keywords after which a '/' starts a regular expression
+REGEX_PREFIX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void')
+
+# CSS comments and string literals, which whitespace collapsing must not touch
+CSS_TOKEN_PATTERN = re.compile(r"""/\*.*?(?:\*/|$)|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'""", re.DOTALL)
+
+# Directory under the cache directory that holds minified output
+MINIFIED_CACHE_DIR = 'minified'
+
+# Cache entries not used for this many seconds are removed
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Beyond this many cache entries, the least recently used are removed
+CACHE_MAX_ENTRIES = 2000
+
+# In-process cache of minified output, keyed like the on-disk cache
+_memory_cache: Dict[str, str] = {}
+
+# Cache directories this process has already pruned
+_pruned_cache_dirs: Set[str] = set()
+
+
+def minify_js(source: str) -> str:
+    """
+    Minify JavaScript source.
+
+    Comments are removed and every line is stripped of surrounding
+    whitespace. String, template and regular expression literals are
+    copied verbatim.
+
+    Args:
+        source (str): JavaScript source.
+
+    Returns:
+        str: Minified JavaScript.
+    """
+    out = []
+    i = 0
+    length = len(source)
+    # Stack of open template literals; each entry is the brace depth of the
+    # ${...} expression currently being scanned inside that template
+    templates = []
+
+    while i < length:
+        char = source[i]
+        nxt = source[i + 1] if i + 1 < length else ''
+
+        if templates and templates[-1] is None:
+            # Inside the literal text of a template string
+            if char == '\\':
+                out.append(source[i:i + 2])
+                i += 2
+            elif char == '`':
+                templates.pop()
+                out.append(char)
+                i += 1
+            elif char == '$' and nxt == '{':
+                templates[-1] = 0
+                out.append('${')
+                i += 2
+            else:
+                out.append(char)
+                i += 1
+            continue
+
+        if char == '/' and nxt == '/':
+            end = source.find('\n', i)
+            i = length if end == -1 else end
+        elif char == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            # Keep tokens on either side of the comment apart
+            if out and not out[-1].isspace():
+                out.append(' ')
+        elif char in ('"', "'"):
+            end = _find_string_end(source, i, char)
+            out.append(source[i:end])
+            i = end
+        elif char == '/' and _starts_regex(out):
+            end = _find_regex_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif char == '`':
+            templates.append(None)
+            out.append(char)
+            i += 1
+        elif char == '{' and templates:
+            templates[-1] += 1
+            out.append(char)
+            i += 1
+        elif char == '}' and templates:
+            if templates[-1] == 0:
+                # End of a ${...} expression; back to template text
+                templates[-1] = None
+            else:
+                templates[-1] -= 1
+            out.append(char)
+            i += 1
+        elif char == '\n':
+            _strip_trailing_whitespace(out)
+            if out and out[-1] != '\n':
+                out.append('\n')
+            i += 1
+            # Drop the indentation of the next line
+            while i < length and source[i] in ' \t\r':
+                i += 1
+        elif char in ' \t' and (not out or out[-1] in (' ', '\n')):
+            # Collapse runs of spaces and drop leading whitespace
+            i += 1
+        else:
+            out.append(char if char != '\t' else ' ')
+            i += 1
+
+    _strip_trailing_whitespace(out)
+    return ''.join(out).strip('\n')
+
+
+def _find_string_end(source: str, start: int, quote: str) -> int:
+    """Return the index just past the string literal starting at start."""
+    i = start + 1
+    while i < len(source):
+        if source[i] == '\\':
+            i += 2
+        elif source[i] == quote or source[i] == '\n':
+            return i + 1
+        else:
+            i += 1
+    return len(source)
+
+
+def _find_regex_end(source: str, start: int) -> int:
+    """Return the index just past the regex literal starting at start."""
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '\n':
+            return i
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            # Flags
+            while i < len(source) and source[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return len(source)
+
+
+def _starts_regex(out: list) -> bool:
+    """Decide whether a '/' following the output so far begins a regex."""
+    text = ''.join(out[-16:]).rstrip()
+    if not text:
+        return True
+    if text.endswith(('++', '--')):
+        # A postfix increment or decrement ends an operand
+        return False
+    if text[-1] in REGEX_PREFIX_CHARS:
+        return True
+    return any(
+        text.endswith(keyword) and not (text[:-len(keyword)][-1:].isalnum())
+        for keyword in REGEX_PREFIX_KEYWORDS
+    )
+
+
+def _strip_trailing_whitespace(out: list) -> None:
+    """Remove trailing spaces and tabs from the output buffer."""
+    while out and out[-1] in (' ', '\t', '\r'):
+        out.pop()
+
+
+def minify_css(source: str) -> str:
+    """
+    Minify CSS source.
+
+    Comments are removed and whitespace is collapsed. String literals are
+    copied verbatim.
+
+    Args:
+        source (str): CSS source.
+
+    Returns:
+        str: Minified CSS.
+    """
+    out = []
+    # Text outside strings since the last string, with comments removed
+    text = []
+    position = 0
+
+    for match in CSS_TOKEN_PATTERN.finditer(source):
+        text.append(source[position:match.start()])
+        position = match.end()
+        if match.group(0).startswith('/*'):
+            continue
+        out.append(_minify_css_text(''.join(text)))
+        out.append(match.group(0))
+        text = []
+
+    text.append(source[position:])
+    out.append(_minify_css_text(''.join(text)))
+
+    return ''.join(out).strip()
+
+
+def _minify_css_text(css: str) -> str:
+    """Collapse whitespace in CSS text that contains no strings or comments."""
+    # Collapse whitespace
+    css = re.sub(r'\s+', ' ', css)
+
+    # Remove whitespace around punctuation that never needs it
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+
+    # The last declaration in a block does not need a semicolon
+    return css.replace(';}', '}')
+
+
+def minify_html(source: str) -> str:
+    """
+    Minify an HTML document.
+
+    Inline ``<style>`` and ``<script>`` blocks are minified with the CSS and
+    JavaScript minifiers. ``<pre>`` and ``<textarea>`` blocks are left alone.
+
+    Args:
+        source (str): HTML source.
+
+    Returns:
+        str: Minified HTML.
+    """
+    block_pattern = re.compile(
+        r'(<(style|script|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)',
+        re.DOTALL | re.IGNORECASE
+    )
+
+    out = []
+    position = 0
+    for match in block_pattern.finditer(source):
+        out.append(_minify_markup(source[position:match.start()]))
+
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == 'style':
+            body = minify_css(body)
+        elif tag == 'script' and 'src=' not in open_tag.lower():
+            body = '\n' + minify_js(body) + '\n'
+
+        out.append(open_tag + body + close_tag)
+        position = match.end()
+
+    out.append(_minify_markup(source[position:]))
+
+    return '\n'.join(part for part in out if part)
+
+
+def _minify_markup(markup: str) -> str:
+    """Remove comments, indentation and blank lines from plain markup."""
+    # Keep conditional comments, drop everything else
+    markup = re.sub(r'<!--(?!\[if).*?-->', '', markup, flags=re.DOTALL)
+    lines = (line.strip() for line in markup.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+MINIFIERS = {
+    'html': minify_html,
+    'css': minify_css,
+    'js': minify_js,
+}
+
+
+def get_minifier_kind(filename: str) -> Optional[str]:
+    """
+    Get the minifier kind for a filename.
+
+    Args:
+        filename (str): The filename to check.
+
+    Returns:
+        Optional[str]: 'html', 'css' or 'js', or None if the file is not
+            minified.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    return {
+        '.html': 'html',
+        '.htm': 'html',
+        '.css': 'css',
+        '.js': 'js',
+    }.get(extension)
+
+
+def minify(source: str, kind: str, cache_dir: Optional[Path] = None) -> str:
+    """
+    Minify source text, reusing cached output when available.
+
+    The cache key is a hash of the minifier version, the kind and the source
+    text. Since the source is the rendered template, the key changes whenever
+    the template, the configuration or the content items change.
+
+    Every course version and, in multi-SCO builds, every launch page adds
+    entries, so the on-disk cache is pruned the first time this process uses
+    it; see prune_minified_cache.
+
+    Args:
+        source (str): The text to minify.
+        kind (str): One of 'html', 'css' or 'js'.
+        cache_dir (Path, optional): Directory for the on-disk cache. If not
+            given, only the in-process cache is used.
+
+    Returns:
+        str: Minified text.
+    """
+    key = hashlib.sha256(
+        f"{MINIFIER_VERSION}:{kind}:".encode('utf-8') + source.encode('utf-8')
+    ).hexdigest()
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    cache_path = None
+    if cache_dir is not None:
+        if str(cache_dir) not in _pruned_cache_dirs:
+            _pruned_cache_dirs.add(str(cache_dir))
+            prune_minified_cache(Path(cache_dir))
+
+        cache_path = Path(cache_dir) / MINIFIED_CACHE_DIR / key[:2] / key
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                minified = f.read()
+            _memory_cache[key] = minified
+            # Mark the entry as used, so pruning keeps it
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return minified
+        except OSError:
+            pass
+
+    minified = MINIFIERS[kind](source)
+    _memory_cache[key] = minified
+
+    if cache_path is not None:
+        try:
+            os.makedirs(cache_path.parent, exist_ok=True)
+            # Write under a temporary name so readers never see a partial entry
+            tmp_path = cache_path.with_name(f"{key}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(minified)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is an optimization; a read-only cache is not an error
+            pass
+
+    return minified
+
+
+def prune_minified_cache(
+    cache_dir: Path,
+    max_age: Optional[float] = None,
+    max_entries: Optional[int] = None
+) -> int:
+    """
+    Remove old entries from the on-disk cache of minified output.
+
+    Entries are aged by modification time, which is refreshed whenever an
+    entry is used. Entries not used within max_age are removed, and then the
+    least recently used entries beyond max_entries. Temporary files left by
+    interrupted writes are removed once they are older than max_age.
+
+    Args:
+        cache_dir (Path): The build cache directory.
+        max_age (float, optional): Maximum age of an entry in seconds.
+            Defaults to CACHE_MAX_AGE.
+        max_entries (int, optional): Maximum number of entries kept.
+            Defaults to CACHE_MAX_ENTRIES.
+
+    Returns:
+        int: Number of files removed.
+    """
+    max_age = CACHE_MAX_AGE if max_age is None else max_age
+    max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+    root = Path(cache_dir) / MINIFIED_CACHE_DIR
+    cutoff = time.time() - max_age
+
+    entries = []
+    try:
+        for bucket in os.scandir(root):
+            if not bucket.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(bucket.path):
+                try:
+                    entries.append((entry.stat(follow_symlinks=False).st_mtime, entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        return 0
+
+    # Newest first, so the entries past the limit are the least recently used
+    entries.sort(reverse=True)
+    removed = 0
+    kept = 0
+    for mtime, path in entries:
+        if path.endswith('.tmp'):
+            # A recent temporary file may be being written by another build
+            expired = mtime < cutoff
+        else:
+            expired = mtime < cutoff or kept >= max_entries
+            kept += 0 if expired else 1
+        if not expired:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            # Another build may have removed it already
+            pass
+
+    return removed
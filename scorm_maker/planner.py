@@ -0,0 +1,365 @@
+"""
+Build planning for SCORM-Maker.
+
+This module predicts what a build would produce without building anything:
+which content items would be packaged, how large the package would be and
+how long the build would take. Only file sizes are read from the input,
+plus small samples used to estimate how well each file type compresses.
+"""
+
+import json
+import os
+import tarfile
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .archive import normalize_member_name
+from .content_processor import process_content
+from .utils import format_size, get_cache_dir
+
+# Bytes read from the start of a file to sample its compression ratio
+SAMPLE_SIZE = 256 * 1024
+
+# Number of files sampled per file type; the largest files are sampled
+SAMPLES_PER_TYPE = 3
+
+# Compression ratios used when a file type is not sampled
+DEFAULT_COMPRESSION_RATIOS = {
+    '.html': 0.3,
+    '.htm': 0.3,
+    '.css': 0.25,
+    '.js': 0.3,
+    '.json': 0.25,
+    '.xml': 0.2,
+    '.svg': 0.35,
+    '.txt': 0.4,
+}
+
+# Ratio for file types with no default, assumed to be already compressed
+DEFAULT_COMPRESSION_RATIO = 1.0
+
+# Approximate size of the generated runtime files, and of the manifest and
+# content index entries generated per content item
+GENERATED_BASE_SIZE = 32 * 1024
+GENERATED_ITEM_SIZE = 400
+GENERATED_COMPRESSION_RATIO = 0.25
+
+# Bytes of ZIP headers per member (local header and central directory
+# entry, excluding the name, which appears in both)
+ZIP_MEMBER_OVERHEAD = 30 + 46
+ZIP_END_RECORD_SIZE = 22
+
+# Build throughput assumed until a build has been recorded, in bytes per second
+DEFAULT_THROUGHPUT = 50 * 1024 * 1024
+
+# Builds smaller than this are dominated by fixed costs and are not recorded
+MIN_RECORDED_BYTES = 1024 * 1024
+
+# Weight of the latest build in the recorded throughput average
+THROUGHPUT_SMOOTHING = 0.3
+
+THROUGHPUT_FILE = 'throughput.json'
+
+
+class PlanError(Exception):
+    """Exception raised for build planning errors."""
+    pass
+
+
+def plan_package(input_path: Path, config: Dict, sample: bool = True, max_size: Optional[int] = None) -> Dict:
+    """
+    Plan a build without building the package.
+
+    Args:
+        input_path (Path): Path to the input directory or archive.
+        config (Dict): Configuration dictionary.
+        sample (bool, optional): Whether to sample files to estimate
+            compression ratios. Defaults to True.
+        max_size (int, optional): Package size limit in bytes. The plan
+            reports whether the estimated size exceeds it.
+
+    Returns:
+        Dict: The plan, with the content items, per-type size estimates,
+            and the estimated package size and build time.
+
+    Raises:
+        PlanError: If the input cannot be scanned.
+    """
+    content_items = process_content(input_path, config)
+
+    try:
+        if input_path.is_dir():
+            files, compressed_sizes = scan_directory(input_path), {}
+        else:
+            files, compressed_sizes = scan_archive(input_path)
+    except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise PlanError(f"Error scanning input '{input_path}': {str(e)}")
+
+    sizes = dict(files)
+
+    # Group files by type
+    groups: Dict[str, List[Tuple[str, int]]] = {}
+    for name, size in files:
+        groups.setdefault(os.path.splitext(name)[1].lower(), []).append((name, size))
+
+    types = []
+    for extension, members in sorted(groups.items()):
+        size = sum(member_size for _, member_size in members)
+
+        if all(name in compressed_sizes for name, _ in members):
+            # Members of a ZIP input are copied as they are
+            estimated = sum(compressed_sizes[name] for name, _ in members)
+            ratio = estimated / size if size else 1.0
+            source = 'archive'
+        elif sample and input_path.is_dir():
+            ratio = sample_compression_ratio(input_path, members)
+            estimated = int(size * ratio)
+            source = 'sampled'
+        else:
+            ratio = DEFAULT_COMPRESSION_RATIOS.get(extension, DEFAULT_COMPRESSION_RATIO)
+            estimated = int(size * ratio)
+            source = 'default'
+
+        estimated += sum(ZIP_MEMBER_OVERHEAD + 2 * len(name.encode('utf-8')) for name, _ in members)
+
+        types.append({
+            'extension': extension or '(none)',
+            'files': len(members),
+            'size': size,
+            'ratio': round(ratio, 3),
+            'ratio_source': source,
+            'estimated_size': estimated,
+        })
+
+    generated_size = int(
+        (GENERATED_BASE_SIZE + GENERATED_ITEM_SIZE * len(content_items)) * GENERATED_COMPRESSION_RATIO
+    )
+    input_size = sum(sizes.values())
+    estimated_size = sum(entry['estimated_size'] for entry in types) + generated_size + ZIP_END_RECORD_SIZE
+
+    throughput, throughput_source = load_throughput(config)
+
+    return {
+        'input': str(input_path),
+        'package': f"{config['package']['title'].replace(' ', '_')}.zip",
+        'content_items': [
+            {
+                'path': Path(item['rel_path']).as_posix(),
+                'title': item['title'],
+                'type': item['type'],
+                'size': sizes.get(Path(item['rel_path']).as_posix(), 0),
+            }
+            for item in content_items
+        ],
+        'files': len(files),
+        'input_size': input_size,
+        'types': types,
+        'generated_size': generated_size,
+        'estimated_size': estimated_size,
+        'throughput': int(throughput),
+        'throughput_source': throughput_source,
+        'estimated_seconds': round(input_size / throughput, 2),
+        'max_size': max_size,
+        'exceeds_max_size': max_size is not None and estimated_size > max_size,
+    }
+
+
+def scan_directory(input_dir: Path) -> List[Tuple[str, int]]:
+    """
+    List every file under a directory with its size.
+
+    Symbolic links to directories are not followed, matching the files a
+    build packages; symbolic links to files are listed with the size of
+    their target.
+
+    Args:
+        input_dir (Path): The directory to scan.
+
+    Returns:
+        List[Tuple[str, int]]: POSIX paths relative to the directory, and sizes.
+    """
+    files = []
+    stack = [(input_dir, '')]
+
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, name + '/'))
+                elif entry.is_file():
+                    files.append((name, entry.stat().st_size))
+
+    return files
+
+
+def scan_archive(archive_path: Path) -> Tuple[List[Tuple[str, int]], Dict[str, int]]:
+    """
+    List every file in an archive with its size.
+
+    Args:
+        archive_path (Path): Path to the archive.
+
+    Returns:
+        Tuple[List[Tuple[str, int]], Dict[str, int]]: Member names and
+            sizes, and for ZIP files, the compressed size of each member.
+    """
+    files = []
+    compressed_sizes = {}
+
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path, 'r') as source:
+            for info in source.infolist():
+                name = normalize_member_name(info.filename)
+                if info.is_dir() or name is None:
+                    continue
+                files.append((name, info.file_size))
+                compressed_sizes[name] = info.compress_size
+    else:
+        with tarfile.open(archive_path, 'r:*') as source:
+            for member in source.getmembers():
+                name = normalize_member_name(member.name)
+                if member.isfile() and name is not None:
+                    files.append((name, member.size))
+
+    return files, compressed_sizes
+
+
+def sample_compression_ratio(input_dir: Path, members: List[Tuple[str, int]]) -> float:
+    """
+    Estimate how well a group of files compresses.
+
+    The start of the largest few files is compressed with the same settings
+    the package is written with.
+
+    Args:
+        input_dir (Path): The input directory.
+        members (List[Tuple[str, int]]): Relative paths and sizes of the files.
+
+    Returns:
+        float: Compressed size divided by original size.
+    """
+    largest = sorted(members, key=lambda member: member[1], reverse=True)[:SAMPLES_PER_TYPE]
+
+    raw_total = 0
+    compressed_total = 0
+    for name, _ in largest:
+        try:
+            with open(input_dir / name, 'rb') as f:
+                data = f.read(SAMPLE_SIZE)
+        except OSError:
+            continue
+
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        raw_total += len(data)
+        compressed_total += len(compressor.compress(data)) + len(compressor.flush())
+
+    if raw_total == 0:
+        return DEFAULT_COMPRESSION_RATIO
+
+    return min(1.0, compressed_total / raw_total)
+
+
+def load_throughput(config: Dict) -> Tuple[float, str]:
+    """
+    Get the build throughput recorded by previous builds.
+
+    Args:
+        config (Dict): Configuration dictionary.
+
+    Returns:
+        Tuple[float, str]: Throughput in input bytes per second, and
+            'recorded' or 'default'.
+    """
+    try:
+        with open(get_cache_dir(config) / THROUGHPUT_FILE, 'r', encoding='utf-8') as f:
+            throughput = float(json.load(f)['bytes_per_second'])
+        if throughput > 0:
+            return throughput, 'recorded'
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return float(DEFAULT_THROUGHPUT), 'default'
+
+
+def record_throughput(config: Dict, input_bytes: int, seconds: float) -> None:
+    """
+    Record the throughput of a build for future plans.
+
+    The recorded figure is a moving average, so one unusually slow or fast
+    build does not dominate it.
+
+    Args:
+        config (Dict): Configuration dictionary.
+        input_bytes (int): Bytes of content written into the package.
+        seconds (float): Time the build took.
+    """
+    if input_bytes < MIN_RECORDED_BYTES or seconds <= 0:
+        return
+
+    cache_path = get_cache_dir(config) / THROUGHPUT_FILE
+    throughput = input_bytes / seconds
+
+    previous, source = load_throughput(config)
+    if source == 'recorded':
+        throughput = THROUGHPUT_SMOOTHING * throughput + (1 - THROUGHPUT_SMOOTHING) * previous
+
+    try:
+        os.makedirs(cache_path.parent, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{THROUGHPUT_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'bytes_per_second': throughput, 'recorded_at': int(time.time())}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The figure is only used for estimates; failing to record it is not an error
+        pass
+
+
+def format_plan(plan: Dict) -> str:
+    """
+    Format a plan as human-readable text.
+
+    Args:
+        plan (Dict): A plan returned by plan_package.
+
+    Returns:
+        str: The formatted plan.
+    """
+    lines = [
+        f"Plan for {plan['package']}",
+        f"Input: {plan['input']} ({plan['files']} files, {len(plan['content_items'])} content items)",
+        "",
+        "Content items:",
+    ]
+
+    for item in plan['content_items']:
+        lines.append(f"  {item['path']:<48} {item['type']:<8} {format_size(item['size']):>10}")
+
+    lines.extend([
+        "",
+        f"  {'Type':<10} {'Files':>7} {'Size':>10} {'Ratio':>7} {'Estimated':>10}",
+    ])
+    for entry in plan['types']:
+        lines.append(
+            f"  {entry['extension']:<10} {entry['files']:>7} {format_size(entry['size']):>10}"
+            f" {entry['ratio']:>7.2f} {format_size(entry['estimated_size']):>10}"
+        )
+    lines.append(f"  {'Generated':<10} {'':>7} {'':>10} {'':>7} {format_size(plan['generated_size']):>10}")
+
+    lines.extend([
+        "",
+        f"Estimated package size: {format_size(plan['estimated_size'])}"
+        f" (input {format_size(plan['input_size'])})",
+        f"Estimated build time: {plan['estimated_seconds']:.2f} s"
+        f" at {format_size(plan['throughput'])}/s ({plan['throughput_source']})",
+    ])
+
+    if plan['max_size'] is not None:
+        status = "EXCEEDS" if plan['exceeds_max_size'] else "within"
+        lines.append(f"Size limit: {format_size(plan['max_size'])} ({status})")
+
+    return '\n'.join(lines)
@@ -4,15 +4,73 @@ SCORM package generation for SCORM-Maker.
 This module handles the creation of SCORM manifests and packages.
 """
 
+import json
 import os
+import re
 import shutil
+import tempfile
+import time
 import zipfile
 from pathlib import Path
 from typing import Dict, List, Optional
 import uuid
 
-from .content_processor import copy_assets
+from .archive import copy_archive_members
+from .asset_hashing import hash_generated_files, hash_input_assets
+from .journal import (
+    JournalError,
+    JournalWriter,
+    entry_to_zipinfo,
+    find_resume_point,
+    get_journal_path,
+    get_lock_path,
+    get_partial_path,
+    get_source_signature,
+    load_journal,
+)
+from .minifier import get_minifier_kind, minify
+from .planner import record_throughput
 from .template_handler import render_template
+from .utils import file_lock, get_cache_dir, get_host_tag, process_exists
+
+# Directory inside the package that holds the generated runtime scripts
+RUNTIME_DIR = 'scorm_package'
+
+# Prefix of the per-build staging directories created in the output directory.
+# Each is named '<prefix>.<host>.<pid>.<random>' so that directories left by
+# builds that were killed can be recognized and removed.
+STAGING_PREFIX = 'scorm_package_temp'
+
+# Directory holding the per-item launch pages in multi-SCO packages
+SCO_LAUNCH_DIR = f'{RUNTIME_DIR}/sco'
+
+# JSON asset listing the content items, loaded by index.html at launch
+CONTENT_INDEX_NAME = 'content_items.json'
+
+# Height in pixels of a table of contents row in index.html. The player
+# positions rows from this value and the row style is derived from it.
+NAV_ROW_HEIGHT = 40
+
+# Maximum length of cmi.suspend_data for each SCORM version
+SUSPEND_DATA_LIMITS = {
+    '1.2': 4096,
+    '2004_3rd': 4000,
+    '2004_4th': 64000,
+}
+
+# Page that displays PDF content items, loaded with the item's path in its query
+PDF_VIEWER_NAME = 'pdf_viewer.html'
+
+# PDF.js build loaded by the PDF viewer unless ui.pdfjs_url is set
+DEFAULT_PDFJS_URL = 'https://cdnjs.cloudflare.com/ajax/libs/pdf.js/3.11.174/pdf.min.js'
+
+# Number of rendered PDF pages the viewer keeps in memory
+PDF_PAGE_CACHE_SIZE = 8
+
+# Wrapper scripts generated for each content type that needs one. Video,
+# audio and images are played inline by the player pages and PDFs by the
+# PDF viewer, so no content type currently needs one.
+CONTENT_WRAPPER_SCRIPTS: Dict[str, str] = {}
 
 
 class ScormGenerationError(Exception):
@@ -23,15 +81,30 @@ class ScormGenerationError(Exception):
 def generate_scorm_package(
     content_items: List[Dict],
     output_dir: Path,
-    config: Dict
+    config: Dict,
+    resume: bool = False
 ) -> Path:
     """
     Generate a SCORM package.
     
+    Content files are written straight from the input into the ZIP file;
+    only the generated files are staged on disk, in a directory unique to
+    this build. Staging directories left in the output directory by builds
+    whose process no longer exists are removed first.
+    
+    The package is written to a partial file with a checkpoint journal, so
+    an interrupted build can be resumed, and moved into place when it is
+    complete. The partial file and journal have fixed names, so builds of
+    the same package hold an advisory lock on the package name while
+    writing it and run one after another; builds of different packages
+    run in parallel.
+    
     Args:
         content_items (List[Dict]): List of processed content items.
         output_dir (Path): Path to the output directory.
         config (Dict): Configuration dictionary.
+        resume (bool, optional): Whether to keep the members written by an
+            interrupted build of the same package. Defaults to False.
         
     Returns:
         Path: Path to the generated SCORM package.
@@ -39,20 +112,33 @@ def generate_scorm_package(
     Raises:
         ScormGenerationError: If there are issues generating the SCORM package.
     """
+    package_dir = None
+    
     try:
-        # Create a temporary directory for the SCORM package
-        package_dir = output_dir / 'scorm_package_temp'
-        os.makedirs(package_dir, exist_ok=True)
+        start_time = time.perf_counter()
         
-        # Copy content files and assets to the package directory
-        input_dir = content_items[0]['file_path'].parent
-        copy_assets(input_dir, package_dir, content_items)
+        # Create a temporary directory for the generated files, unique to
+        # this build, after removing any left by builds that were killed
+        os.makedirs(output_dir, exist_ok=True)
+        remove_stale_staging_dirs(output_dir)
+        package_dir = Path(tempfile.mkdtemp(prefix=get_staging_prefix(), dir=output_dir))
         
-        # Generate the SCORM manifest
-        generate_manifest(package_dir, content_items, config)
+        build = config.get('build', {})
+        multi_sco = config.get('packaging', 'single_sco') == 'multi_sco'
+        
+        package_name = config['package']['title'].replace(' ', '_')
+        zip_path = output_dir / f"{package_name}.zip"
         
-        # Generate the index.html file
-        generate_index_html(package_dir, content_items, config)
+        # Give content files hashed names first, since generated files refer
+        # to them. Content read from an archive keeps its names.
+        input_names = {}
+        if build.get('hash_asset_names', False) and content_items[0].get('archive_path') is None:
+            input_files = list(iter_input_files(get_input_root(content_items), zip_path))
+            input_names = hash_input_assets(input_files, content_items, package_dir, config)
+            content_items = [
+                dict(item, rel_path=Path(input_names.get(Path(item['rel_path']).as_posix(), item['rel_path'])))
+                for item in content_items
+            ]
         
         # Generate the SCORM API wrapper
         generate_scorm_api_wrapper(package_dir, config)
@@ -60,27 +146,320 @@ def generate_scorm_package(
         # Generate content wrappers
         generate_content_wrappers(package_dir, content_items, config)
         
-        # Create the ZIP file
-        package_name = config['package']['title'].replace(' ', '_')
-        zip_path = output_dir / f"{package_name}.zip"
+        # Generate the PDF viewer if the package has PDF content
+        generate_pdf_viewer(package_dir, content_items, config)
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(package_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, package_dir)
-                    zipf.write(file_path, arcname)
+        # Generate the content item list loaded by index.html
+        if not multi_sco:
+            generate_content_index(package_dir, content_items, config)
+        
+        # Give the generated scripts and content list hashed names too
+        asset_names = dict(input_names)
+        if build.get('hash_asset_names', False):
+            generated_assets = get_runtime_scripts(content_items)
+            if not multi_sco:
+                generated_assets.append(f"{RUNTIME_DIR}/{CONTENT_INDEX_NAME}")
+            asset_names.update(hash_generated_files(package_dir, generated_assets))
+        
+        # Generate the SCORM manifest
+        generate_manifest(package_dir, content_items, config, asset_names)
+        
+        if multi_sco:
+            # Generate one launch page per content item
+            generate_sco_launch_pages(package_dir, content_items, config, asset_names)
+        else:
+            # Generate the index.html file
+            generate_index_html(package_dir, content_items, config, asset_names)
         
-        # Clean up the temporary directory
-        shutil.rmtree(package_dir)
+        # Create the ZIP file
+        with file_lock(get_lock_path(zip_path)):
+            packaged_bytes = write_package(
+                zip_path, package_dir, content_items, input_names, resume=resume
+            )
+        
+        # Record how fast this build was so plans can estimate build times
+        record_throughput(config, packaged_bytes, time.perf_counter() - start_time)
         
         return zip_path
     
     except Exception as e:
         raise ScormGenerationError(f"Error generating SCORM package: {str(e)}")
+    
+    finally:
+        # Clean up the temporary directory, whether or not the build succeeded
+        if package_dir is not None:
+            shutil.rmtree(package_dir, ignore_errors=True)
 
 
-def generate_manifest(package_dir: Path, content_items: List[Dict], config: Dict) -> None:
+def get_staging_prefix() -> str:
+    """
+    Get the name prefix of this process's staging directories.
+    
+    Returns:
+        str: ``'<STAGING_PREFIX>.<host>.<pid>.'``; mkdtemp adds a random suffix.
+    """
+    return f"{STAGING_PREFIX}.{get_host_tag()}.{os.getpid()}."
+
+
+def remove_stale_staging_dirs(output_dir: Path) -> None:
+    """
+    Remove staging directories left by builds that were killed.
+    
+    Only directories created on this host by a process that no longer
+    exists are removed, so the staging directories of builds still running,
+    here or on other hosts sharing the output directory, are left alone.
+    
+    Args:
+        output_dir (Path): Path to the output directory.
+    """
+    host = get_host_tag()
+    
+    try:
+        entries = list(os.scandir(output_dir))
+    except OSError:
+        return
+    
+    for entry in entries:
+        parts = entry.name.split('.')
+        if len(parts) != 4 or parts[0] != STAGING_PREFIX or parts[1] != host:
+            continue
+        if not parts[2].isdigit() or process_exists(int(parts[2])):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def get_input_root(content_items: List[Dict]) -> Path:
+    """
+    Get the input directory that content items were found in.
+    
+    Args:
+        content_items (List[Dict]): List of processed content items.
+        
+    Returns:
+        Path: The directory that item ``rel_path`` values are relative to.
+    """
+    item = content_items[0]
+    return Path(item['file_path']).parents[len(Path(item['rel_path']).parts) - 1]
+
+
+def iter_input_files(input_root: Path, zip_path: Optional[Path] = None):
+    """
+    Iterate over every file in the input directory.
+    
+    When the package is written inside the input directory, the output
+    directory is skipped, so the package never contains its own partial
+    file, journal, lock or staging directory, or earlier packages. If the
+    output directory is the input directory itself, those files are
+    skipped by name instead.
+    
+    Args:
+        input_root (Path): The input directory.
+        zip_path (Path, optional): Path of the package being built.
+        
+    Yields:
+        tuple: ``(path, arcname)`` for each file, where ``arcname`` is the
+            POSIX path relative to the input directory.
+    """
+    output_rel = None
+    if zip_path is not None:
+        try:
+            output_rel = os.path.relpath(Path(zip_path).parent.resolve(), Path(input_root).resolve())
+        except ValueError:
+            # On Windows, the output directory is on another drive
+            pass
+        if output_rel is not None and (output_rel == os.pardir or output_rel.startswith(os.pardir + os.sep)):
+            # The output directory is outside the input directory
+            output_rel = None
+    
+    for root, dirs, files in os.walk(input_root):
+        dirs.sort()
+        if output_rel is not None:
+            rel_root = os.path.relpath(root, input_root)
+            if rel_root == output_rel:
+                dirs[:] = [name for name in dirs if not is_build_file(name, zip_path)]
+                files = [name for name in files if not is_build_file(name, zip_path)]
+            else:
+                dirs[:] = [name for name in dirs if os.path.normpath(os.path.join(rel_root, name)) != output_rel]
+        
+        for file in sorted(files):
+            file_path = Path(root) / file
+            yield file_path, file_path.relative_to(input_root).as_posix()
+
+
+def is_build_file(name: str, zip_path: Path) -> bool:
+    """
+    Check whether a name in the output directory belongs to a build.
+    
+    Args:
+        name (str): File or directory name.
+        zip_path (Path): Path of the package being built.
+        
+    Returns:
+        bool: True for the package and its partial file, journal and lock,
+            and for staging directories of any build.
+    """
+    build_files = {
+        zip_path.name,
+        get_partial_path(zip_path).name,
+        get_journal_path(zip_path).name,
+        get_lock_path(zip_path).name,
+    }
+    return name in build_files or name.startswith(f"{STAGING_PREFIX}.")
+
+
+def write_package(
+    zip_path: Path,
+    package_dir: Path,
+    content_items: List[Dict],
+    input_names: Optional[Dict[str, str]] = None,
+    resume: bool = False
+) -> int:
+    """
+    Write the package ZIP file.
+    
+    Input files (or archive members) are written first, straight from the
+    input, and the generated files in the staging directory last. Generated
+    files take precedence over input files of the same name. Every completed
+    member is recorded in a checkpoint journal. If the build fails, the
+    partial file and journal are kept when they hold completed members, so
+    that the build can be resumed, and removed otherwise.
+    
+    The partial file and journal have fixed names, so the caller must hold
+    the package lock.
+    
+    Args:
+        zip_path (Path): Path of the package to create.
+        package_dir (Path): Directory holding the generated files.
+        content_items (List[Dict]): List of processed content items.
+        input_names (Dict[str, str], optional): Package names for input
+            files that are renamed, keyed by their path in the input.
+        resume (bool, optional): Whether to keep the members written by an
+            interrupted build. Defaults to False.
+        
+    Returns:
+        int: Uncompressed bytes written by this run.
+    """
+    archive_path = content_items[0].get('archive_path')
+    input_root = None if archive_path is not None else get_input_root(content_items)
+    header = {
+        'source': str(Path(archive_path or input_root).resolve()),
+        'package': zip_path.name,
+    }
+    
+    generated = {
+        file_path.relative_to(package_dir).as_posix(): file_path
+        for file_path in sorted(package_dir.rglob('*'))
+        if file_path.is_file()
+    }
+    
+    input_names = input_names or {}
+    source_names = {package_name: name for name, package_name in input_names.items()}
+    
+    def get_source(name):
+        if name in generated:
+            return None
+        if archive_path is not None:
+            return Path(archive_path)
+        file_path = input_root / source_names.get(name, name)
+        return file_path if file_path.is_file() else None
+    
+    partial_path = get_partial_path(zip_path)
+    journal_path = get_journal_path(zip_path)
+    
+    # Find the members of an interrupted build that are still valid
+    kept = []
+    if resume and partial_path.exists():
+        try:
+            kept = find_resume_point(load_journal(journal_path, header), partial_path, get_source)
+        except JournalError:
+            kept = []
+    
+    fp = open(partial_path, 'r+b' if kept else 'w+b')
+    
+    resume_offset = kept[-1]['end_offset'] if kept else 0
+    journal = None
+    completed = False
+    
+    try:
+        fp.truncate(resume_offset)
+        fp.seek(resume_offset)
+        journal = JournalWriter(journal_path, fp, header, kept)
+        
+        zipf = zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED)
+        for entry in kept:
+            info = entry_to_zipinfo(entry)
+            zipf.filelist.append(info)
+            zipf.NameToInfo[info.filename] = info
+        done = {entry['name'] for entry in kept}
+        
+        try:
+            if archive_path is not None:
+                source = get_source_signature(archive_path)
+                copy_archive_members(
+                    archive_path,
+                    zipf,
+                    exclude=done | set(generated),
+                    on_copy=lambda info: journal.record(info, zipf.start_dir, source)
+                )
+            else:
+                for file_path, arcname in iter_input_files(input_root, zip_path):
+                    arcname = input_names.get(arcname, arcname)
+                    if arcname in done or arcname in generated:
+                        continue
+                    source = get_source_signature(file_path)
+                    zipf.write(file_path, arcname)
+                    journal.record(zipf.NameToInfo[arcname], zipf.start_dir, source)
+            
+            # Generated files are rendered again on every run, so they go last
+            for arcname, file_path in generated.items():
+                zipf.write(file_path, arcname)
+                journal.record(zipf.NameToInfo[arcname], zipf.start_dir)
+        
+        except BaseException:
+            # Save the progress made so far before giving up
+            try:
+                journal.checkpoint()
+            except OSError:
+                pass
+            raise
+        
+        finally:
+            # On failure this writes a central directory after the last
+            # complete member; a resumed build truncates it away again
+            try:
+                zipf.close()
+            except (OSError, ValueError):
+                pass
+        
+        fp.flush()
+        os.fsync(fp.fileno())
+        completed = True
+    
+    finally:
+        resumable = journal is not None and journal.checkpointed > 0
+        if journal is not None:
+            journal.close()
+        fp.close()
+        
+        if completed:
+            os.replace(partial_path, zip_path)
+        if completed or not resumable:
+            for path in (partial_path, journal_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    return journal.written_bytes
+
+
+def generate_manifest(
+    package_dir: Path,
+    content_items: List[Dict],
+    config: Dict,
+    asset_names: Optional[Dict[str, str]] = None
+) -> None:
     """
     Generate the SCORM manifest file (imsmanifest.xml).
     
@@ -88,6 +467,8 @@ def generate_manifest(package_dir: Path, content_items: List[Dict], config: Dict
         package_dir (Path): Path to the package directory.
         content_items (List[Dict]): List of processed content items.
         config (Dict): Configuration dictionary.
+        asset_names (Dict[str, str], optional): Hashed names of generated
+            files, keyed by their usual path.
     """
     scorm_version = config['scorm_version']
     
@@ -110,6 +491,11 @@ def generate_manifest(package_dir: Path, content_items: List[Dict], config: Dict
         'organization': config['organization'],
         'content_items': content_items,
         'package_id': package_id,
+        'runtime_scripts': get_runtime_scripts(content_items, asset_names),
+        'content_index': get_content_index_path(asset_names),
+        'pdf_viewer': get_pdf_viewer_path(content_items),
+        'packaging': config.get('packaging', 'single_sco'),
+        'sco_launch_pages': [get_sco_launch_path(index) for index in range(len(content_items))],
     }
     
     # Render the manifest template
@@ -121,7 +507,12 @@ def generate_manifest(package_dir: Path, content_items: List[Dict], config: Dict
         f.write(manifest_content)
 
 
-def generate_index_html(package_dir: Path, content_items: List[Dict], config: Dict) -> None:
+def generate_index_html(
+    package_dir: Path,
+    content_items: List[Dict],
+    config: Dict,
+    asset_names: Optional[Dict[str, str]] = None
+) -> None:
     """
     Generate the index.html file.
     
@@ -129,6 +520,8 @@ def generate_index_html(package_dir: Path, content_items: List[Dict], config: Di
         package_dir (Path): Path to the package directory.
         content_items (List[Dict]): List of processed content items.
         config (Dict): Configuration dictionary.
+        asset_names (Dict[str, str], optional): Hashed names of generated
+            files, keyed by their usual path.
     """
     # Prepare the context for the template
     context = {
@@ -138,15 +531,106 @@ def generate_index_html(package_dir: Path, content_items: List[Dict], config: Di
         'ui': config['ui'],
         'completion_criteria': config['completion_criteria'],
         'completion_percentage': config.get('completion_percentage', 100),
+        'runtime_scripts': get_runtime_scripts(content_items, asset_names),
+        'content_index': get_content_index_path(asset_names),
+        'nav_row_height': NAV_ROW_HEIGHT,
     }
     
     # Render the index template
     index_content = render_template('index.html', context)
     
     # Write the index file
-    index_path = package_dir / 'index.html'
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(index_content)
+    write_generated_file(package_dir / 'index.html', index_content, config)
+
+
+def get_sco_launch_path(index: int) -> str:
+    """
+    Get the package path of the launch page for a content item.
+    
+    Args:
+        index (int): Zero-based index of the content item.
+        
+    Returns:
+        str: Path of the launch page relative to the package root.
+    """
+    return f"{SCO_LAUNCH_DIR}/item_{index + 1}.html"
+
+
+def generate_sco_launch_pages(
+    package_dir: Path,
+    content_items: List[Dict],
+    config: Dict,
+    asset_names: Optional[Dict[str, str]] = None
+) -> None:
+    """
+    Generate one launch page per content item for multi-SCO packages.
+    
+    Each page loads the shared runtime scripts and a single content item, so
+    its size does not depend on the number of items in the course.
+    
+    Args:
+        package_dir (Path): Path to the package directory.
+        content_items (List[Dict]): List of processed content items.
+        config (Dict): Configuration dictionary.
+        asset_names (Dict[str, str], optional): Hashed names of generated
+            files, keyed by their usual path.
+    """
+    launch_dir = package_dir / SCO_LAUNCH_DIR
+    os.makedirs(launch_dir, exist_ok=True)
+    
+    # Relative path from a launch page back to the package root
+    root = '../' * (SCO_LAUNCH_DIR.count('/') + 1)
+    
+    runtime_scripts = get_runtime_scripts(content_items, asset_names)
+    
+    for index, item in enumerate(content_items):
+        context = {
+            'package': config['package'],
+            'ui': config['ui'],
+            'item': dict(item, rel_path=Path(item['rel_path'])),
+            'runtime_scripts': runtime_scripts,
+            'root': root,
+        }
+        
+        launch_content = render_template('sco_launch.html', context)
+        write_generated_file(package_dir / get_sco_launch_path(index), launch_content, config)
+
+
+def generate_content_index(package_dir: Path, content_items: List[Dict], config: Dict) -> None:
+    """
+    Generate the JSON list of content items loaded by index.html.
+    
+    Each item is written as a compact ``[path, title, type, required,
+    duration, pages]`` array so that the player can render a table of
+    contents for thousands of items without inlining them into the page.
+    Duration and page count are null when they are unknown.
+    
+    Args:
+        package_dir (Path): Path to the package directory.
+        content_items (List[Dict]): List of processed content items.
+        config (Dict): Configuration dictionary.
+    """
+    content_index = {
+        'fields': ['path', 'title', 'type', 'required', 'duration', 'pages'],
+        'items': [
+            [
+                Path(item['rel_path']).as_posix(),
+                item['title'],
+                item['type'],
+                1 if item['required'] else 0,
+                item.get('metadata', {}).get('duration'),
+                item.get('metadata', {}).get('pages'),
+            ]
+            for item in content_items
+        ],
+    }
+    
+    scorm_package_dir = package_dir / RUNTIME_DIR
+    os.makedirs(scorm_package_dir, exist_ok=True)
+    
+    content_index_path = scorm_package_dir / CONTENT_INDEX_NAME
+    with open(content_index_path, 'w', encoding='utf-8') as f:
+        json.dump(content_index, f, ensure_ascii=False, separators=(',', ':'))
 
 
 def generate_scorm_api_wrapper(package_dir: Path, config: Dict) -> None:
@@ -172,6 +656,7 @@ def generate_scorm_api_wrapper(package_dir: Path, config: Dict) -> None:
         'package': config['package'],
         'completion_criteria': config['completion_criteria'],
         'completion_percentage': config.get('completion_percentage', 100),
+        'suspend_data_limit': SUSPEND_DATA_LIMITS[scorm_version],
     }
     
     # Render the API wrapper template
@@ -182,9 +667,7 @@ def generate_scorm_api_wrapper(package_dir: Path, config: Dict) -> None:
     os.makedirs(scorm_package_dir, exist_ok=True)
     
     # Write the API wrapper file
-    api_wrapper_path = scorm_package_dir / 'SCORM_API_wrapper.js'
-    with open(api_wrapper_path, 'w', encoding='utf-8') as f:
-        f.write(api_wrapper_content)
+    write_generated_file(scorm_package_dir / 'SCORM_API_wrapper.js', api_wrapper_content, config)
 
 
 def generate_content_wrappers(package_dir: Path, content_items: List[Dict], config: Dict) -> None:
@@ -200,26 +683,126 @@ def generate_content_wrappers(package_dir: Path, content_items: List[Dict], conf
     scorm_package_dir = package_dir / 'scorm_package'
     os.makedirs(scorm_package_dir, exist_ok=True)
     
-    # Generate PDF viewer wrapper
-    pdf_items = [item for item in content_items if item['type'] == 'pdf']
-    if pdf_items:
-        pdf_wrapper_content = render_template('pdf_viewer_wrapper.js', {'config': config})
-        pdf_wrapper_path = scorm_package_dir / 'pdf_viewer_wrapper.js'
-        with open(pdf_wrapper_path, 'w', encoding='utf-8') as f:
-            f.write(pdf_wrapper_content)
-    
-    # Generate video player wrapper
-    video_items = [item for item in content_items if item['type'] == 'video']
-    if video_items:
-        video_wrapper_content = render_template('video_player_wrapper.js', {'config': config})
-        video_wrapper_path = scorm_package_dir / 'video_player_wrapper.js'
-        with open(video_wrapper_path, 'w', encoding='utf-8') as f:
-            f.write(video_wrapper_content)
-    
-    # Generate audio player wrapper
-    audio_items = [item for item in content_items if item['type'] == 'audio']
-    if audio_items:
-        audio_wrapper_content = render_template('audio_player_wrapper.js', {'config': config})
-        audio_wrapper_path = scorm_package_dir / 'audio_player_wrapper.js'
-        with open(audio_wrapper_path, 'w', encoding='utf-8') as f:
-            f.write(audio_wrapper_content)
+    # Generate a wrapper for each content type present in the package
+    for content_type, wrapper_name in CONTENT_WRAPPER_SCRIPTS.items():
+        if not any(item['type'] == content_type for item in content_items):
+            continue
+        
+        wrapper_content = render_template(wrapper_name, {'config': config})
+        write_generated_file(scorm_package_dir / wrapper_name, wrapper_content, config)
+
+
+def generate_pdf_viewer(package_dir: Path, content_items: List[Dict], config: Dict) -> None:
+    """
+    Generate the page that displays PDF content items.
+    
+    The viewer renders PDFs with PDF.js, fetching the file in byte ranges
+    and rendering only the pages on or near the screen, so the first page
+    of a large PDF shows without downloading the whole file. The item is
+    marked complete once enough of its pages have been viewed.
+    
+    Args:
+        package_dir (Path): Path to the package directory.
+        content_items (List[Dict]): List of processed content items.
+        config (Dict): Configuration dictionary.
+    """
+    viewer_path = get_pdf_viewer_path(content_items)
+    if viewer_path is None:
+        return
+    
+    ui = config['ui']
+    pdfjs_url = ui.get('pdfjs_url', DEFAULT_PDFJS_URL)
+    
+    # The worker script sits next to the library in PDF.js builds
+    pdfjs_worker_url = ui.get('pdfjs_worker_url', re.sub(r'pdf(\.min)?\.js$', r'pdf.worker\1.js', pdfjs_url))
+    
+    context = {
+        'package': config['package'],
+        'ui': ui,
+        'pdfjs_url': pdfjs_url,
+        'pdfjs_worker_url': pdfjs_worker_url,
+        'completion_percentage': ui.get('pdf_completion_percentage', 100),
+        'page_cache_size': PDF_PAGE_CACHE_SIZE,
+    }
+    
+    viewer_content = render_template(PDF_VIEWER_NAME, context)
+    
+    os.makedirs(package_dir / RUNTIME_DIR, exist_ok=True)
+    write_generated_file(package_dir / viewer_path, viewer_content, config)
+
+
+def get_pdf_viewer_path(content_items: List[Dict]) -> Optional[str]:
+    """
+    Get the package path of the PDF viewer.
+    
+    Args:
+        content_items (List[Dict]): List of processed content items.
+        
+    Returns:
+        Optional[str]: Path of the viewer relative to the package root, or
+            None if the package has no PDF content.
+    """
+    if not any(item['type'] == 'pdf' for item in content_items):
+        return None
+    
+    return f"{RUNTIME_DIR}/{PDF_VIEWER_NAME}"
+
+
+def get_runtime_scripts(
+    content_items: List[Dict],
+    asset_names: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    Get the package paths of the runtime scripts loaded by index.html.
+    
+    Args:
+        content_items (List[Dict]): List of processed content items.
+        asset_names (Dict[str, str], optional): Hashed names of generated
+            files, keyed by their usual path.
+        
+    Returns:
+        List[str]: Script paths relative to the package root, in load order.
+    """
+    scripts = [f"{RUNTIME_DIR}/SCORM_API_wrapper.js"]
+    content_types = {item['type'] for item in content_items}
+    for content_type, wrapper_name in CONTENT_WRAPPER_SCRIPTS.items():
+        if content_type in content_types:
+            scripts.append(f"{RUNTIME_DIR}/{wrapper_name}")
+    
+    asset_names = asset_names or {}
+    return [asset_names.get(script, script) for script in scripts]
+
+
+def get_content_index_path(asset_names: Optional[Dict[str, str]] = None) -> str:
+    """
+    Get the package path of the content item list.
+    
+    Args:
+        asset_names (Dict[str, str], optional): Hashed names of generated
+            files, keyed by their usual path.
+        
+    Returns:
+        str: Path of the content item list relative to the package root.
+    """
+    path = f"{RUNTIME_DIR}/{CONTENT_INDEX_NAME}"
+    return (asset_names or {}).get(path, path)
+
+
+def write_generated_file(path: Path, content: str, config: Dict) -> None:
+    """
+    Write a generated file, minifying it first if enabled.
+    
+    Minification is controlled by ``build.minify`` and applies to HTML, CSS
+    and JavaScript files. Minified output is cached by content hash.
+    
+    Args:
+        path (Path): Destination path.
+        content (str): File content.
+        config (Dict): Configuration dictionary.
+    """
+    kind = get_minifier_kind(path.name)
+    if kind and config.get('build', {}).get('minify', False):
+        content = minify(content, kind, get_cache_dir(config))
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
@@ -5,6 +5,7 @@ This module handles loading and rendering of templates.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 import jinja2
@@ -32,6 +33,25 @@ def get_template_path() -> Path:
     return template_path
 
 
+@lru_cache(maxsize=None)
+def get_environment() -> jinja2.Environment:
+    """
+    Get the Jinja2 environment for the templates directory.
+    
+    The environment is created once, so each template is compiled once per
+    process no matter how many times it is rendered.
+    
+    Returns:
+        jinja2.Environment: The template environment.
+    """
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(get_template_path()),
+        autoescape=jinja2.select_autoescape(['html', 'xml']),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+
 def render_template(template_name: str, context: Dict) -> str:
     """
     Render a template with the given context.
@@ -47,16 +67,8 @@ def render_template(template_name: str, context: Dict) -> str:
         TemplateError: If there are issues loading or rendering the template.
     """
     try:
-        # Get the templates directory
-        template_dir = get_template_path()
-        
-        # Set up the Jinja2 environment
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_dir),
-            autoescape=jinja2.select_autoescape(['html', 'xml']),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        # Get the Jinja2 environment
+        env = get_environment()
         
         # Load the template
         template = env.get_template(template_name)
@@ -2,9 +2,13 @@
 SCORM API Wrapper for SCORM 2004
 */
 
+// Maximum length of cmi.suspend_data for this SCORM version
+const SUSPEND_DATA_LIMIT = {{ suspend_data_limit }};
+
 class SCORM_API {
     constructor() {
         this.api = null;
+        this.suspendData = "";
         this.findAPI(window);
     }
     
@@ -31,9 +35,15 @@ class SCORM_API {
         console.log("Initialize result:", result);
         
         if (result === "true" || result === true) {
-            // Set initial values
-            this.setValue("cmi.completion_status", "incomplete");
-            this.setValue("cmi.success_status", "unknown");
+            // Read saved progress before anything else is written
+            this.suspendData = this.getValue("cmi.suspend_data") || "";
+            
+            // Set initial values, keeping the status of a previous attempt
+            const status = this.getValue("cmi.completion_status");
+            if (status === "" || status === "unknown" || status === "not attempted") {
+                this.setValue("cmi.completion_status", "incomplete");
+                this.setValue("cmi.success_status", "unknown");
+            }
             this.setValue("cmi.score.min", "0");
             this.setValue("cmi.score.max", "100");
             return true;
@@ -47,6 +57,11 @@ class SCORM_API {
             return false;
         }
         
+        // Ask the LMS to keep suspend_data for the next session
+        if (this.suspendData) {
+            this.setValue("cmi.exit", "suspend");
+        }
+        
         const result = this.api.Terminate("");
         console.log("Terminate result:", result);
         
@@ -100,4 +115,123 @@ class SCORM_API {
         
         return (result === "true" || result === true);
     }
+    
+    setCompletionStatus(completed, progressMeasure) {
+        this.setValue("cmi.completion_status", completed ? "completed" : "incomplete");
+        this.setValue("cmi.success_status", completed ? "passed" : "unknown");
+        return this.setValue("cmi.progress_measure", String(progressMeasure));
+    }
+    
+    restoreProgress(itemCount) {
+        return SCORM_API.decodeProgress(this.suspendData, itemCount);
+    }
+    
+    saveProgress(completionStatus) {
+        const encoded = SCORM_API.encodeProgress(completionStatus);
+        
+        // Only write when the saved state actually changes
+        if (encoded === this.suspendData) {
+            return true;
+        }
+        
+        if (encoded.length > SUSPEND_DATA_LIMIT) {
+            console.error(`Progress needs ${encoded.length} characters of suspend_data; the limit is ${SUSPEND_DATA_LIMIT}.`);
+            return false;
+        }
+        
+        if (this.setValue("cmi.suspend_data", encoded)) {
+            this.suspendData = encoded;
+            return true;
+        }
+        
+        return false;
+    }
+    
+    /*
+    Progress is stored as one bit per content item, in whichever of two
+    encodings is shorter:
+      "B<base64url>"  - bitset, least significant bit first, trailing zero bytes dropped
+      "R<a>.<b>.<c>"  - base-36 run lengths, alternating incomplete and complete,
+                        starting with incomplete
+    A course with 10,000 items needs at most 1,668 characters.
+    */
+    static encodeProgress(completionStatus) {
+        const itemCount = completionStatus.length;
+        
+        // Bitset encoding
+        const bytes = new Uint8Array(Math.ceil(itemCount / 8));
+        let usedBytes = 0;
+        for (let index = 0; index < itemCount; index++) {
+            if (completionStatus[index]) {
+                bytes[index >> 3] |= 1 << (index & 7);
+                usedBytes = (index >> 3) + 1;
+            }
+        }
+        
+        let binary = "";
+        for (let offset = 0; offset < usedBytes; offset += 8192) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(offset, Math.min(offset + 8192, usedBytes)));
+        }
+        const bitset = "B" + btoa(binary).replace(/\+/g, "-").replace(/\//g, "_").replace(/=+$/, "");
+        
+        // Run-length encoding
+        const runs = [];
+        let current = 0;
+        let runLength = 0;
+        for (let index = 0; index < itemCount; index++) {
+            const value = completionStatus[index] ? 1 : 0;
+            if (value === current) {
+                runLength++;
+            } else {
+                runs.push(runLength.toString(36));
+                current = value;
+                runLength = 1;
+            }
+        }
+        // A trailing run of incomplete items is implied
+        if (current === 1) {
+            runs.push(runLength.toString(36));
+        }
+        const runLengths = "R" + runs.join(".");
+        
+        return runLengths.length < bitset.length ? runLengths : bitset;
+    }
+    
+    static decodeProgress(encoded, itemCount) {
+        const completionStatus = new Uint8Array(itemCount);
+        
+        try {
+            if (encoded.charAt(0) === "B") {
+                const base64 = encoded.slice(1).replace(/-/g, "+").replace(/_/g, "/");
+                const binary = atob(base64 + "===".slice((base64.length + 3) % 4));
+                const limit = Math.min(itemCount, binary.length * 8);
+                for (let index = 0; index < limit; index++) {
+                    if (binary.charCodeAt(index >> 3) & (1 << (index & 7))) {
+                        completionStatus[index] = 1;
+                    }
+                }
+            } else if (encoded.charAt(0) === "R" && encoded.length > 1) {
+                let index = 0;
+                let value = 0;
+                for (const run of encoded.slice(1).split(".")) {
+                    const runLength = parseInt(run, 36);
+                    if (isNaN(runLength)) {
+                        throw new Error(`Invalid run length '${run}'`);
+                    }
+                    const end = Math.min(itemCount, index + runLength);
+                    if (value === 1) {
+                        completionStatus.fill(1, index, end);
+                    }
+                    index = end;
+                    value = 1 - value;
+                }
+            }
+        } catch (e) {
+            // Unreadable progress is treated as no progress
+            console.error("Ignoring invalid suspend_data:", e);
+            completionStatus.fill(0);
+        }
+        
+        return completionStatus;
+    }
 }
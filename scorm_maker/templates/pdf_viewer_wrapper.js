@@ -1,155 +0,0 @@
-/*
-PDF Viewer Wrapper for SCORM-Maker
-
-This script provides a wrapper for PDF.js to display PDF files in a SCORM package.
-In a real implementation, you would include the full PDF.js library.
-*/
-
-// Create a PDF viewer HTML page
-document.write(`
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>PDF Viewer</title>
-    <style>
-        body {
-            margin: 0;
-            padding: 0;
-            font-family: Arial, sans-serif;
-        }
-        
-        #pdf-container {
-            width: 100%;
-            height: 100vh;
-            overflow: auto;
-        }
-        
-        #pdf-controls {
-            position: fixed;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background-color: rgba(0, 0, 0, 0.7);
-            color: white;
-            padding: 10px;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-        }
-        
-        #pdf-controls button {
-            margin: 0 5px;
-            padding: 5px 10px;
-            background-color: #4CAF50;
-            color: white;
-            border: none;
-            border-radius: 3px;
-            cursor: pointer;
-        }
-        
-        #pdf-controls button:hover {
-            background-color: #45a049;
-        }
-        
-        #page-num {
-            margin: 0 10px;
-        }
-    </style>
-</head>
-<body>
-    <div id="pdf-container"></div>
-    
-    <div id="pdf-controls">
-        <button id="prev">Previous</button>
-        <span id="page-num">Page: 1 / 1</span>
-        <button id="next">Next</button>
-        <button id="zoom-in">Zoom In</button>
-        <button id="zoom-out">Zoom Out</button>
-    </div>
-    
-    <script>
-        // Get the PDF file from the URL parameter
-        const urlParams = new URLSearchParams(window.location.search);
-        const pdfFile = urlParams.get('file');
-        
-        // Simple PDF viewer implementation
-        // In a real implementation, you would use PDF.js
-        
-        let currentPage = 1;
-        let totalPages = 1;
-        let scale = 1.0;
-        
-        // Load the PDF
-        function loadPDF() {
-            // In a real implementation, you would use PDF.js to load the PDF
-            // For this example, we'll just create a simple viewer
-            
-            const container = document.getElementById('pdf-container');
-            container.innerHTML = `
-                <div style="padding: 20px; text-align: center;">
-                    <h2>PDF Viewer</h2>
-                    <p>Viewing: ${pdfFile}</p>
-                    <p>This is a placeholder for the PDF viewer.</p>
-                    <p>In a real implementation, you would use PDF.js to render the PDF.</p>
-                    <iframe src="${pdfFile}" width="100%" height="500px"></iframe>
-                </div>
-            `;
-            
-            // Set up event listeners
-            document.getElementById('prev').addEventListener('click', prevPage);
-            document.getElementById('next').addEventListener('click', nextPage);
-            document.getElementById('zoom-in').addEventListener('click', zoomIn);
-            document.getElementById('zoom-out').addEventListener('click', zoomOut);
-            
-            // Notify parent window that the PDF is loaded
-            if (window.parent && window.parent.markComplete) {
-                window.parent.markComplete();
-            }
-        }
-        
-        // Navigate to the previous page
-        function prevPage() {
-            if (currentPage > 1) {
-                currentPage--;
-                renderPage(currentPage);
-            }
-        }
-        
-        // Navigate to the next page
-        function nextPage() {
-            if (currentPage < totalPages) {
-                currentPage++;
-                renderPage(currentPage);
-            }
-        }
-        
-        // Zoom in
-        function zoomIn() {
-            scale += 0.1;
-            renderPage(currentPage);
-        }
-        
-        // Zoom out
-        function zoomOut() {
-            if (scale > 0.2) {
-                scale -= 0.1;
-                renderPage(currentPage);
-            }
-        }
-        
-        // Render a specific page
-        function renderPage(pageNum) {
-            // Update the page number display
-            document.getElementById('page-num').textContent = `Page: ${pageNum} / ${totalPages}`;
-            
-            // In a real implementation, you would use PDF.js to render the page
-        }
-        
-        // Load the PDF when the page loads
-        window.onload = loadPDF;
-    </script>
-</body>
-</html>
-`);
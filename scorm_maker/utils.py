@@ -7,9 +7,23 @@ This module provides helper functions for the SCORM-Maker tool.
 import os
 import re
 import shutil
+import socket
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl; msvcrt provides the equivalent locking
+    fcntl = None
+    import msvcrt
+
+# Windows API values used by process_exists
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -119,3 +133,136 @@ def generate_unique_id(prefix: str = 'id_') -> str:
     """
     import uuid
     return f"{prefix}{uuid.uuid4().hex[:8]}"
+
+
+def get_cache_dir(config: Optional[Dict] = None) -> Path:
+    """
+    Get the directory used for build caches.
+    
+    The directory can be set with ``build.cache_dir`` in the configuration.
+    Otherwise ``$XDG_CACHE_HOME/scorm-maker`` is used, falling back to
+    ``~/.cache/scorm-maker``.
+    
+    Args:
+        config (Dict, optional): Configuration dictionary.
+        
+    Returns:
+        Path: The cache directory. It is not created by this function.
+    """
+    build = (config or {}).get('build') or {}
+    if build.get('cache_dir'):
+        return Path(build['cache_dir']).expanduser()
+    
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+    return Path(cache_home).expanduser() / 'scorm-maker'
+
+
+def format_size(size: float) -> str:
+    """
+    Format a size in bytes for display.
+    
+    Args:
+        size (float): The size in bytes.
+        
+    Returns:
+        str: The size with a binary unit, e.g. '1.5 MB'.
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024 or unit == 'GB':
+            break
+        size /= 1024
+    
+    if unit == 'B':
+        return f"{int(size)} B"
+    
+    return f"{size:.1f} {unit}"
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Hold an exclusive advisory lock on a file, waiting until it is free.
+    
+    The lock file is created if needed and left in place afterwards, since
+    removing it could let another process lock a different file of the
+    same name.
+    
+    Args:
+        path (Path): Path to the lock file.
+        
+    Yields:
+        None: The lock is held for the duration of the ``with`` block.
+    """
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            # msvcrt locks a byte range; LK_LOCK retries for a few seconds
+            # at a time, so keep trying until the lock is free
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def get_host_tag() -> str:
+    """
+    Get the name of this host, reduced to characters safe in file names.
+    
+    Returns:
+        str: The host name with anything but letters, digits and '-'
+            replaced by '-'.
+    """
+    return re.sub(r'[^A-Za-z0-9-]', '-', socket.gethostname()) or 'localhost'
+
+
+def process_exists(pid: int) -> bool:
+    """
+    Check whether a process is running on this host.
+    
+    Args:
+        pid (int): The process ID.
+        
+    Returns:
+        bool: True if a process with this ID exists. A process that exists
+            but belongs to another user counts as existing.
+    """
+    if pid <= 0:
+        return False
+    
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows, so ask the kernel
+        import ctypes
+        
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return kernel32.GetLastError() == ERROR_ACCESS_DENIED
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    
+    return True
@@ -0,0 +1,267 @@
+"""
+Package verification for SCORM-Maker.
+
+This module checks existing SCORM packages without extracting them. Only the
+ZIP central directory is read, and the manifest is parsed as a stream straight
+out of the archive.
+"""
+
+import os
+import threading
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from urllib.parse import unquote
+
+MANIFEST_NAME = 'imsmanifest.xml'
+
+# Read size used when checking member CRCs
+CRC_CHUNK_SIZE = 1024 * 1024
+
+
+class VerificationError(Exception):
+    """Exception raised for package verification errors."""
+    pass
+
+
+def verify_package(
+    package_path: Path,
+    check_crc: bool = False,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    Verify a single SCORM package.
+
+    The manifest is checked against the archive's central directory: every
+    resource ``href`` and ``<file href>`` must name a member of the archive,
+    and identifiers must be unique. Members that the manifest never mentions
+    are reported as orphaned.
+
+    Args:
+        package_path (Path): Path to the SCORM package (ZIP file).
+        check_crc (bool, optional): Whether to decompress every member and
+            check its CRC. Defaults to False.
+        workers (int, optional): Number of threads used for CRC checks.
+            Defaults to the executor's default.
+
+    Returns:
+        Dict: Verification report for the package.
+    """
+    report = {
+        'package': str(package_path),
+        'valid': False,
+        'members': 0,
+        'missing': [],
+        'orphaned': [],
+        'duplicate_identifiers': [],
+        'crc_errors': [],
+        'errors': [],
+    }
+
+    try:
+        with zipfile.ZipFile(package_path, 'r') as zipf:
+            members = {
+                info.filename for info in zipf.infolist() if not info.is_dir()
+            }
+            report['members'] = len(members)
+
+            if MANIFEST_NAME not in members:
+                raise VerificationError(f"Package has no {MANIFEST_NAME}")
+
+            with zipf.open(MANIFEST_NAME) as manifest_file:
+                references, identifiers = scan_manifest(manifest_file)
+
+        report['missing'] = sorted(references - members)
+        report['orphaned'] = sorted(members - references - {MANIFEST_NAME})
+        report['duplicate_identifiers'] = sorted(
+            identifier for identifier, count in identifiers.items() if count > 1
+        )
+
+        if check_crc:
+            report['crc_errors'] = check_member_crcs(package_path, workers)
+
+    except (zipfile.BadZipFile, ET.ParseError, VerificationError, OSError) as e:
+        report['errors'].append(str(e))
+    except Exception as e:
+        # Anything else is reported against this package, so that one bad
+        # package does not stop the others from being verified
+        report['errors'].append(f"Unexpected error: {type(e).__name__}: {str(e)}")
+
+    report['valid'] = not (
+        report['errors']
+        or report['missing']
+        or report['duplicate_identifiers']
+        or report['crc_errors']
+    )
+
+    return report
+
+
+def scan_manifest(manifest_file) -> tuple:
+    """
+    Collect file references and identifiers from a manifest stream.
+
+    Args:
+        manifest_file: Binary file object containing imsmanifest.xml.
+
+    Returns:
+        tuple: A set of referenced archive paths, and a dictionary mapping
+            each identifier to the number of times it occurs.
+    """
+    references: Set[str] = set()
+    identifiers: Dict[str, int] = {}
+
+    for _, element in ET.iterparse(manifest_file, events=('end',)):
+        tag = element.tag.rsplit('}', 1)[-1]
+
+        identifier = element.get('identifier')
+        if identifier is not None:
+            identifiers[identifier] = identifiers.get(identifier, 0) + 1
+
+        if tag in ('resource', 'file'):
+            href = element.get('href')
+            if href:
+                references.add(normalize_href(href))
+
+        # Children have already been handled, so drop them to keep memory flat
+        element.clear()
+
+    return references, identifiers
+
+
+def normalize_href(href: str) -> str:
+    """
+    Convert a manifest href into the matching archive member name.
+
+    Args:
+        href (str): The href value from the manifest.
+
+    Returns:
+        str: The archive member name.
+    """
+    # Query strings and fragments are not part of the file name
+    path = href.split('#', 1)[0].split('?', 1)[0]
+    path = unquote(path).replace('\\', '/')
+
+    while path.startswith('./'):
+        path = path[2:]
+
+    return path
+
+
+def check_member_crcs(package_path: Path, workers: Optional[int] = None) -> List[str]:
+    """
+    Decompress every member of a package and check its CRC.
+
+    Each worker thread opens one handle on the archive and reads all of its
+    members through it, so members can be read in parallel without parsing
+    the central directory again for every member; zlib releases the GIL
+    while inflating. Members that cannot be decompressed, such as encrypted
+    members or members using an unsupported compression method, are
+    reported along with members whose CRC does not match.
+
+    Args:
+        package_path (Path): Path to the SCORM package.
+        workers (int, optional): Number of worker threads.
+
+    Returns:
+        List[str]: Names of members whose data does not match their CRC or
+            cannot be read.
+    """
+    with zipfile.ZipFile(package_path, 'r') as zipf:
+        infos = [info for info in zipf.infolist() if not info.is_dir()]
+
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def get_handle():
+        if not hasattr(local, 'zipf'):
+            local.zipf = zipfile.ZipFile(package_path, 'r')
+            with handles_lock:
+                handles.append(local.zipf)
+        return local.zipf
+
+    def check(info):
+        try:
+            with get_handle().open(info) as member:
+                while member.read(CRC_CHUNK_SIZE):
+                    pass
+        except (
+            zipfile.BadZipFile,
+            zipfile.LargeZipFile,
+            OSError,
+            EOFError,
+            zlib.error,
+            RuntimeError,
+            NotImplementedError,
+        ):
+            return info.filename
+        return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return sorted(name for name in executor.map(check, infos) if name)
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def find_packages(path: Path) -> List[Path]:
+    """
+    Find the packages to verify at a path.
+
+    Args:
+        path (Path): A package file, or a directory of packages.
+
+    Returns:
+        List[Path]: Sorted list of package paths.
+    """
+    if path.is_dir():
+        return sorted(
+            Path(entry.path) for entry in os.scandir(path)
+            if entry.is_file() and entry.name.lower().endswith('.zip')
+        )
+
+    return [path]
+
+
+def verify_packages(
+    paths: List[Path],
+    check_crc: bool = False,
+    workers: Optional[int] = None
+) -> List[Dict]:
+    """
+    Verify several packages concurrently.
+
+    ``workers`` bounds the total number of threads: packages are verified
+    ``workers`` at a time, and the CRC checks of each package share what is
+    left over, with at least one thread each.
+
+    Args:
+        paths (List[Path]): Package files or directories of packages.
+        check_crc (bool, optional): Whether to check member CRCs.
+        workers (int, optional): Number of threads to use. Defaults to the
+            executor's default.
+
+    Returns:
+        List[Dict]: One verification report per package, in path order.
+    """
+    packages = []
+    for path in paths:
+        packages.extend(find_packages(Path(path)))
+
+    if not packages:
+        return []
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    package_workers = min(workers, len(packages))
+    crc_workers = max(1, workers // package_workers)
+
+    with ThreadPoolExecutor(max_workers=package_workers) as executor:
+        return list(executor.map(
+            lambda package: verify_package(package, check_crc, crc_workers), packages
+        ))
@@ -0,0 +1,136 @@
+"""
+Shared fixtures for the SCORM-Maker tests.
+"""
+
+import copy
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+BASE_CONFIG = {
+    'package': {
+        'title': 'Test Course',
+        'identifier': 'TEST_COURSE',
+        'version': '1.0',
+        'language': 'en-US',
+        'description': 'A course used by the tests.',
+    },
+    'organization': {
+        'name': 'Test Organization',
+        'identifier': 'TEST_ORG',
+    },
+    'scorm_version': '2004_4th',
+    'completion_criteria': 'all_items',
+    'ui': {
+        'theme': {
+            'primary_color': '#3498db',
+            'secondary_color': '#2c3e50',
+            'text_color': '#333333',
+            'background_color': '#ffffff',
+        },
+        'show_progress_bar': True,
+        'show_table_of_contents': True,
+    },
+    'content_items': [
+        {'file': '01_intro.html', 'title': 'Introduction'},
+        {'file': '02_manual.pdf', 'title': 'Manual'},
+        {'file': '03_summary.html', 'title': 'Summary'},
+    ],
+}
+
+# Files of the test course, keyed by path relative to the course root
+COURSE_FILES = {
+    '01_intro.html': (
+        '<html><head><title>Introduction</title><link rel="stylesheet" href="css/style.css"></head>'
+        '<body><img src="img/logo.png">' + 'Welcome to the course. ' * 200 + '</body></html>'
+    ).encode('utf-8'),
+    '02_manual.pdf': b'%PDF-1.4\n1 0 obj<</Type/Pages/Count 2>>endobj\ntrailer<<>>\n%%EOF\n',
+    '03_summary.html': b'<html><head><title>Summary</title></head><body>Summary</body></html>',
+    'css/style.css': b'body { background: url("../img/logo.png"); }\n',
+    'img/logo.png': bytes(range(256)) * 16,
+}
+
+
+def make_config(tmp_path: Path, **overrides) -> dict:
+    """
+    Build a test configuration whose build caches live under tmp_path.
+
+    Args:
+        tmp_path (Path): Temporary directory of the test.
+        **overrides: Top-level configuration values to replace.
+
+    Returns:
+        dict: The configuration.
+    """
+    config = copy.deepcopy(BASE_CONFIG)
+    config['build'] = {'cache_dir': str(tmp_path / 'cache')}
+    config.update(copy.deepcopy(overrides))
+    return config
+
+
+def write_course(root: Path, extra_files: int = 0) -> Path:
+    """
+    Write the test course to a directory.
+
+    Args:
+        root (Path): Directory to write the course to.
+        extra_files (int, optional): Number of additional asset files, to
+            make packages large enough to need several checkpoints.
+
+    Returns:
+        Path: The course directory.
+    """
+    for name, data in COURSE_FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    if extra_files:
+        (root / 'assets').mkdir(exist_ok=True)
+        for index in range(extra_files):
+            (root / 'assets' / f'asset_{index:04d}.txt').write_bytes(f'asset {index}\n'.encode('ascii') * 50)
+
+    return root
+
+
+@pytest.fixture
+def config(tmp_path):
+    """A test configuration."""
+    return make_config(tmp_path)
+
+
+@pytest.fixture
+def course_dir(tmp_path):
+    """The test course as a directory."""
+    return write_course(tmp_path / 'course')
+
+
+@pytest.fixture
+def course_zip(tmp_path, course_dir):
+    """The test course as a ZIP file with deflated and stored members."""
+    path = tmp_path / 'course.zip'
+    with zipfile.ZipFile(path, 'w') as zipf:
+        for name in sorted(COURSE_FILES):
+            compression = zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED
+            zipf.write(course_dir / name, name, compress_type=compression)
+    return path
+
+
+@pytest.fixture
+def course_tar(tmp_path, course_dir):
+    """The test course as a gzipped tar file."""
+    path = tmp_path / 'course.tar.gz'
+    with tarfile.open(path, 'w:gz') as tar:
+        for name in sorted(COURSE_FILES):
+            tar.add(course_dir / name, arcname=name)
+    return path
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """An empty output directory."""
+    path = tmp_path / 'output'
+    path.mkdir()
+    return path
@@ -0,0 +1,112 @@
+"""
+Tests for extracting metadata from content files.
+"""
+
+import json
+import os
+import shutil
+import struct
+
+import pytest
+
+from scorm_maker.analyzers import analyze_content, analyze_file, get_stat_key, prune_stat_keys
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import generate_scorm_package
+
+from conftest import make_config, write_course
+
+
+def mp4_box(box_type, payload):
+    return struct.pack('>I', 8 + len(payload)) + box_type + payload
+
+
+def write_mp4(path, timescale, duration):
+    mvhd = mp4_box(b'mvhd', b'\x00\x00\x00\x00' + struct.pack('>IIII', 0, 0, timescale, duration) + b'\x00' * 80)
+    path.write_bytes(mp4_box(b'ftyp', b'isom\x00\x00\x00\x00') + mp4_box(b'moov', mvhd))
+    return path
+
+
+def test_mp4_duration(tmp_path):
+    assert analyze_file(write_mp4(tmp_path / 'clip.mp4', 1000, 95000), 'video')[1] == {'duration': 95.0}
+
+
+@pytest.mark.parametrize('data', [
+    b'\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01\x42\xf7\x81\x01',
+    b'\x1a\x45\xdf\xa3\x84\x42\x86\x81\x01\x18\x53\x80\x67\x01',
+    b'\x1a',
+    b'',
+])
+def test_truncated_webm_has_no_metadata(tmp_path, data):
+    path = tmp_path / 'clip.webm'
+    path.write_bytes(data)
+
+    assert analyze_file(path, 'video')[1] == {}
+
+
+@pytest.mark.parametrize('data', [
+    b'\x00\x00\x00\x10moov\x00\x00\x00\x08mvhd',
+    b'\x00\x00\x00\x10moov\x00\x00\x00\x0cmvhd\x01',
+])
+def test_truncated_mp4_has_no_metadata(tmp_path, data):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(data)
+
+    assert analyze_file(path, 'video')[1] == {}
+
+
+def test_video_items_build_and_keep_their_duration(tmp_path, output_dir):
+    course = tmp_path / 'course'
+    course.mkdir()
+    (course / '01_intro.html').write_text('<html><head><title>Intro</title></head></html>')
+    write_mp4(course / '02_clip.mp4', 1000, 95000)
+    (course / '03_broken.webm').write_bytes(b'\x1a\x45\xdf\xa3\x9f\x42\x86\x81\x01\x42\xf7\x81\x01')
+
+    config = make_config(tmp_path, content_items=[
+        {'file': '01_intro.html', 'title': 'Intro'},
+        {'file': '02_clip.mp4', 'title': 'Clip'},
+        {'file': '03_broken.webm', 'title': 'Broken'},
+    ])
+    items = process_content(course, config)
+    analyze_content(items, config)
+
+    assert [item.get('metadata') for item in items] == [{'title': 'Intro'}, {'duration': 95.0}, {}]
+    assert generate_scorm_package(items, output_dir, config).exists()
+
+
+def test_cache_drops_files_that_are_gone_or_changed(tmp_path):
+    config = make_config(tmp_path)
+    kept = write_course(tmp_path / 'kept')
+    temporary = write_course(tmp_path / 'temporary')
+    (temporary / '01_intro.html').write_text('<html><head><title>Only here</title></head></html>')
+
+    analyze_content(process_content(kept, config), config)
+    analyze_content(process_content(temporary, config), config)
+    shutil.rmtree(temporary)
+
+    # An edited file replaces its old entry
+    edited = kept / '03_summary.html'
+    edited.write_text('<html><head><title>Edited</title></head></html>')
+    os.utime(edited, ns=(0, os.stat(edited).st_mtime_ns + 10 ** 9))
+
+    analyze_content(process_content(kept, config), config)
+
+    cache = json.loads((tmp_path / 'cache' / 'analysis.json').read_text(encoding='utf-8'))
+    assert sorted(cache['stats']) == sorted(
+        get_stat_key(kept / name) for name in ('01_intro.html', '02_manual.pdf', '03_summary.html')
+    )
+    assert set(cache['results']) == set(cache['stats'].values())
+    assert {'title': 'Only here'} not in cache['results'].values()
+
+
+def test_prune_keeps_keys_in_use(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_text('data')
+    current = get_stat_key(path)
+    cache = {current: 'a', f"{tmp_path / 'gone.txt'}|4|0": 'b', f"{path}|4|0": 'c'}
+
+    assert prune_stat_keys(cache) == 2
+    assert cache == {current: 'a'}
+
+    # Keys known to be in use are not checked again
+    cache = {'in use|1|1': 'd'}
+    assert prune_stat_keys(cache, seen={'in use|1|1'}) == 0
@@ -0,0 +1,146 @@
+"""
+Tests for building packages from ZIP and tar archives.
+"""
+
+import zipfile
+
+import pytest
+
+from scorm_maker import archive
+from scorm_maker.archive import list_archive_members
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import ScormGenerationError, generate_scorm_package
+from scorm_maker.verifier import verify_package
+
+from conftest import COURSE_FILES
+
+
+def build(input_path, output_dir, config):
+    items = process_content(input_path, config)
+    return generate_scorm_package(items, output_dir, config)
+
+
+def read_raw_data(zip_path, info):
+    """Read the compressed data of a member, after its local header."""
+    with open(zip_path, 'rb') as f:
+        f.seek(info.header_offset + 26)
+        name_length = int.from_bytes(f.read(2), 'little')
+        extra_length = int.from_bytes(f.read(2), 'little')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        return f.read(info.compress_size)
+
+
+def test_list_archive_members(course_zip, course_tar):
+    assert sorted(list_archive_members(course_zip)) == sorted(COURSE_FILES)
+    assert sorted(list_archive_members(course_tar)) == sorted(COURSE_FILES)
+
+
+def test_zip_members_are_copied_without_recompression(course_zip, output_dir, config):
+    package = build(course_zip, output_dir, config)
+
+    with zipfile.ZipFile(course_zip) as source, zipfile.ZipFile(package) as zipf:
+        for name in COURSE_FILES:
+            source_info = source.getinfo(name)
+            info = zipf.getinfo(name)
+            assert info.compress_type == source_info.compress_type
+            assert info.compress_size == source_info.compress_size
+            assert info.CRC == source_info.CRC
+            assert zipf.read(name) == COURSE_FILES[name]
+            assert read_raw_data(package, info) == read_raw_data(course_zip, source_info)
+
+    assert verify_package(package, check_crc=True)['valid']
+
+
+def test_tar_members_are_streamed_into_the_package(course_tar, output_dir, config):
+    package = build(course_tar, output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        for name, data in COURSE_FILES.items():
+            assert zipf.getinfo(name).compress_type == zipfile.ZIP_DEFLATED
+            assert zipf.read(name) == data
+
+    assert verify_package(package, check_crc=True)['valid']
+
+
+def test_generated_files_replace_archive_members(tmp_path, course_dir, output_dir, config):
+    zip_path = tmp_path / 'with_index.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for name, data in COURSE_FILES.items():
+            zipf.writestr(name, data)
+        zipf.writestr('index.html', 'vendor index')
+
+    package = build(zip_path, output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        assert zipf.namelist().count('index.html') == 1
+        assert zipf.read('index.html') != b'vendor index'
+
+
+def test_members_with_other_compression_are_deflated(tmp_path, output_dir, config):
+    zip_path = tmp_path / 'bzip2.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_BZIP2) as zipf:
+        for name, data in COURSE_FILES.items():
+            zipf.writestr(name, data)
+
+    package = build(zip_path, output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        for info in zipf.infolist():
+            assert info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED), info.filename
+        for name, data in COURSE_FILES.items():
+            assert zipf.read(name) == data
+
+    assert verify_package(package, check_crc=True)['valid']
+
+
+def set_member_header_field(zip_path, name, offset, value, size=2):
+    """Overwrite a field in a member's local header and central directory entry."""
+    with zipfile.ZipFile(zip_path) as zipf:
+        info = zipf.getinfo(name)
+
+    data = bytearray(zip_path.read_bytes())
+    central = data.find(b'PK\001\002')
+    while data[central + 46:central + 46 + len(name)] != name.encode('utf-8'):
+        central = data.find(b'PK\001\002', central + 4)
+
+    # The central directory entry has the version made by field first
+    data[info.header_offset + offset:info.header_offset + offset + size] = value.to_bytes(size, 'little')
+    data[central + offset + 2:central + offset + 2 + size] = value.to_bytes(size, 'little')
+    zip_path.write_bytes(bytes(data))
+
+
+def test_unsupported_compression_method_is_reported(course_zip, output_dir, config):
+    # Mark a member as Deflate64, which zipfile cannot decompress
+    set_member_header_field(course_zip, '01_intro.html', 8, 9)
+
+    items = process_content(course_zip, config)
+    with pytest.raises(ScormGenerationError, match='compression method'):
+        generate_scorm_package(items, output_dir, config)
+
+
+def test_encrypted_members_are_reported(course_zip, output_dir, config):
+    set_member_header_field(course_zip, '01_intro.html', 6, 0x01)
+
+    items = process_content(course_zip, config)
+    with pytest.raises(ScormGenerationError, match='encrypted'):
+        generate_scorm_package(items, output_dir, config)
+
+
+def test_raw_copy_is_supported_by_this_python(tmp_path):
+    # Raw copies rely on private ZipFile attributes; this fails if a
+    # Python release renames them, rather than quietly recompressing
+    with zipfile.ZipFile(tmp_path / 'package.zip', 'w') as zipf:
+        assert archive.supports_raw_copy(zipf)
+
+
+def test_members_are_recompressed_without_zipfile_internals(monkeypatch, course_zip, output_dir, config):
+    monkeypatch.setattr(archive, 'ZIPFILE_WRITE_INTERNALS', archive.ZIPFILE_WRITE_INTERNALS + ('_missing',))
+
+    package = build(course_zip, output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        for name, data in COURSE_FILES.items():
+            assert zipf.getinfo(name).compress_type == zipfile.ZIP_DEFLATED
+            assert zipf.read(name) == data
+
+    assert verify_package(package, check_crc=True)['valid']
@@ -0,0 +1,270 @@
+"""
+Tests for content-hashed asset names and the rewriting of references to them.
+"""
+
+import hashlib
+import json
+import re
+import shutil
+import zipfile
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from scorm_maker.asset_hashing import (
+    CSS_IMPORT_PATTERN,
+    CSS_URL_PATTERN,
+    HTML_REFERENCE_PATTERN,
+    get_hashed_name,
+    hash_input_assets,
+    resolve_reference,
+    rewrite_references,
+)
+from scorm_maker.analyzers import get_stat_key
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import generate_scorm_package, iter_input_files
+from scorm_maker.verifier import verify_package
+
+from conftest import COURSE_FILES, make_config
+
+HTML_PATTERNS = (HTML_REFERENCE_PATTERN, CSS_URL_PATTERN)
+CSS_PATTERNS = (CSS_URL_PATTERN, CSS_IMPORT_PATTERN)
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8}\.')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_hashed_name_puts_the_hash_before_the_extension():
+    digest = sha256(b'data')
+
+    assert get_hashed_name('media/intro.mp4', digest) == f'media/intro.{digest[:8]}.mp4'
+    assert get_hashed_name('archive.tar.gz', digest) == f'archive.tar.{digest[:8]}.gz'
+    assert get_hashed_name('LICENSE', digest) == f'LICENSE.{digest[:8]}'
+
+
+@pytest.mark.parametrize('base_dir, url, expected', [
+    ('', 'img/logo.png', 'img/logo.png'),
+    ('css', '../img/logo.png', 'img/logo.png'),
+    ('css', './fonts/a.woff', 'css/fonts/a.woff'),
+    ('a/b', '../../c.png', 'c.png'),
+    ('', 'my%20image.png', 'my image.png'),
+    ('', 'logo.png?v=2', 'logo.png'),
+    ('', 'logo.png#icon', 'logo.png'),
+    ('', '  logo.png  ', 'logo.png'),
+    ('css', '../../outside.png', None),
+    ('', '../outside.png', None),
+    ('', '/absolute.png', None),
+    ('', '//cdn.example.com/logo.png', None),
+    ('', 'https://example.com/logo.png', None),
+    ('', 'data:image/png;base64,AAAA', None),
+    ('', 'mailto:someone@example.com', None),
+    ('', 'javascript:void(0)', None),
+    ('', '#section', None),
+    ('', '', None),
+])
+def test_resolve_reference(base_dir, url, expected):
+    assert resolve_reference(PurePosixPath(base_dir), url) == expected
+
+
+def test_rewrite_keeps_query_fragment_and_escapes():
+    names = {
+        'img/logo.png': 'img/logo.0123abcd.png',
+        'img/my photo.jpg': 'img/my photo.89abcdef.jpg',
+    }
+    html = (
+        '<img src="img/logo.png?v=2">'
+        "<img SRC='img/logo.png#icon'>"
+        '<img src="img/my%20photo.jpg">'
+        '<a href="img/other.png">'
+        '<a href="https://example.com/img/logo.png">'
+    )
+
+    rewritten = rewrite_references(html, HTML_PATTERNS, PurePosixPath(''), names)
+
+    assert rewritten == (
+        '<img src="img/logo.0123abcd.png?v=2">'
+        "<img SRC='img/logo.0123abcd.png#icon'>"
+        '<img src="img/my%20photo.89abcdef.jpg">'
+        '<a href="img/other.png">'
+        '<a href="https://example.com/img/logo.png">'
+    )
+
+
+def test_rewrite_uses_the_url_as_written_relative_to_the_file():
+    names = {'img/logo.png': 'img/logo.0123abcd.png', 'LICENSE': 'LICENSE.89abcdef'}
+    css = (
+        'a { background: url(../img/logo.png); }\n'
+        'b { background: url( "../img/./logo.png" ); }\n'
+        'c { background: url(\'../IMG/logo.png\'); }\n'
+        '@import "../LICENSE";\n'
+    )
+
+    rewritten = rewrite_references(css, CSS_PATTERNS, PurePosixPath('css'), names)
+
+    assert rewritten == (
+        'a { background: url(../img/logo.0123abcd.png); }\n'
+        'b { background: url( "../img/./logo.0123abcd.png" ); }\n'
+        'c { background: url(\'../IMG/logo.png\'); }\n'
+        '@import "../LICENSE.89abcdef";\n'
+    )
+
+
+def write_files(root, files):
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return list(iter_input_files(root))
+
+
+def hash_course(tmp_path, files, content_items=('index.html',)):
+    root = tmp_path / 'course'
+    package_dir = tmp_path / 'staging'
+    package_dir.mkdir(parents=True)
+    input_files = write_files(root, files)
+    items = [{'rel_path': Path(name)} for name in content_items]
+    names = hash_input_assets(input_files, items, package_dir, make_config(tmp_path))
+    return names, package_dir
+
+
+def test_style_sheets_are_hashed_after_rewriting(tmp_path):
+    image = bytes(range(256))
+    files = {
+        'index.html': b'<link rel="stylesheet" href="css/style.css"><img src="img/logo.png">',
+        'css/style.css': b'body { background: url("../img/logo.png"); }\n',
+        'img/logo.png': image,
+    }
+
+    names, package_dir = hash_course(tmp_path, files)
+
+    assert names['img/logo.png'] == f'img/logo.{sha256(image)[:8]}.png'
+    css = f'body {{ background: url("../img/logo.{sha256(image)[:8]}.png"); }}\n'.encode('utf-8')
+    assert names['css/style.css'] == f'css/style.{sha256(css)[:8]}.css'
+    assert (package_dir / names['css/style.css']).read_bytes() == css
+
+    # Pages keep their names, and point at the hashed assets
+    assert 'index.html' not in names
+    assert (package_dir / 'index.html').read_bytes() == (
+        f'<link rel="stylesheet" href="{names["css/style.css"]}"><img src="{names["img/logo.png"]}">'
+    ).encode('utf-8')
+
+
+def test_changed_image_changes_the_style_sheet_name(tmp_path):
+    files = {
+        'index.html': b'<link rel="stylesheet" href="style.css">',
+        'style.css': b'body { background: url(logo.png); }',
+        'logo.png': b'first',
+    }
+    first, _ = hash_course(tmp_path / 'first', files)
+    second, _ = hash_course(tmp_path / 'second', dict(files, **{'logo.png': b'second'}))
+
+    assert first['logo.png'] != second['logo.png']
+    assert first['style.css'] != second['style.css']
+
+
+def test_imported_style_sheets_keep_their_names(tmp_path):
+    files = {
+        'index.html': b'<link rel="stylesheet" href="css/main.css">',
+        'css/main.css': b'@import "base.css";\nh1 { color: red; }\n',
+        'css/base.css': b'body { background: url(../img/bg.png); }\n',
+        'img/bg.png': b'background',
+    }
+
+    names, package_dir = hash_course(tmp_path, files)
+
+    assert 'css/base.css' not in names
+    assert HASHED_NAME.search(names['css/main.css'])
+
+    # The imported sheet still has its references rewritten
+    assert (package_dir / 'css' / 'base.css').read_bytes() == (
+        f'body {{ background: url(../{names["img/bg.png"]}); }}\n'.encode('utf-8')
+    )
+    assert (package_dir / names['css/main.css']).read_bytes() == files['css/main.css']
+
+
+def test_files_only_used_by_scripts_keep_their_names(tmp_path):
+    files = {
+        'index.html': b'<script src="app.js"></script>',
+        'app.js': b'fetch("data.json");',
+        'data.json': b'{}',
+    }
+
+    names, _ = hash_course(tmp_path, files)
+
+    assert set(names) == {'app.js'}
+
+
+def test_line_endings_and_undecodable_bytes_are_kept(tmp_path):
+    page = b'<html>\r\n<p>caf\xe9 \xff\xfe</p>\r\n<img src="logo.png">\n\r\n</html>'
+    files = {'index.html': page, 'logo.png': b'logo'}
+
+    names, package_dir = hash_course(tmp_path, files)
+
+    assert (package_dir / 'index.html').read_bytes() == page.replace(
+        b'logo.png', names['logo.png'].encode('utf-8')
+    )
+
+
+def test_pages_without_hashed_references_are_not_staged(tmp_path):
+    files = {'index.html': b'<a href="https://example.com/">link</a>', 'other.html': b'<p>other</p>'}
+
+    names, package_dir = hash_course(tmp_path, files, content_items=('index.html', 'other.html'))
+
+    assert names == {}
+    assert list(package_dir.iterdir()) == []
+
+
+def test_build_with_hashed_asset_names(tmp_path, course_dir, output_dir):
+    config = make_config(tmp_path, build={'cache_dir': str(tmp_path / 'cache'), 'hash_asset_names': True})
+
+    package = generate_scorm_package(process_content(course_dir, config), output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        names = set(zipf.namelist())
+        intro = zipf.read('01_intro.html').decode('utf-8')
+        manifest = zipf.read('imsmanifest.xml').decode('utf-8')
+
+    logo = f'img/logo.{sha256(COURSE_FILES["img/logo.png"])[:8]}.png'
+    assert logo in names
+    assert 'img/logo.png' not in names
+    assert f'src="{logo}"' in intro
+    assert '01_intro.html' in names and '03_summary.html' in names
+
+    style = [name for name in names if name.startswith('css/style.')]
+    assert len(style) == 1 and HASHED_NAME.search(style[0])
+    assert f'href="{style[0]}"' in intro
+
+    # The PDF content item is renamed in the manifest as well
+    pdf = [name for name in names if name.endswith('.pdf')]
+    assert len(pdf) == 1 and HASHED_NAME.search(pdf[0])
+    assert pdf[0] in manifest
+
+    assert verify_package(package, check_crc=True)['valid']
+
+
+def test_hashed_names_are_stable_between_builds(tmp_path, course_dir):
+    config = make_config(tmp_path, build={'cache_dir': str(tmp_path / 'cache'), 'hash_asset_names': True})
+
+    first = generate_scorm_package(process_content(course_dir, config), tmp_path / 'first', config)
+    second = generate_scorm_package(process_content(course_dir, config), tmp_path / 'second', config)
+
+    with zipfile.ZipFile(first) as a, zipfile.ZipFile(second) as b:
+        assert sorted(a.namelist()) == sorted(b.namelist())
+
+
+def test_hash_cache_drops_files_that_are_gone(tmp_path):
+    hash_course(tmp_path / 'first', {'index.html': b'<img src="a.png">', 'a.png': b'a'})
+    config = make_config(tmp_path / 'first')
+    shutil.rmtree(tmp_path / 'first' / 'course')
+
+    root = tmp_path / 'second' / 'course'
+    package_dir = tmp_path / 'second' / 'staging'
+    package_dir.mkdir(parents=True)
+    input_files = write_files(root, {'index.html': b'<img src="b.png">', 'b.png': b'b'})
+    hash_input_assets(input_files, [{'rel_path': Path('index.html')}], package_dir, config)
+
+    cache = json.loads((tmp_path / 'first' / 'cache' / 'asset_hashes.json').read_text(encoding='utf-8'))
+    assert list(cache) == [get_stat_key(root / 'b.png')]
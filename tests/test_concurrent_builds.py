@@ -0,0 +1,95 @@
+"""
+Tests for many builds writing to one output directory at the same time.
+"""
+
+import multiprocessing
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import STAGING_PREFIX, generate_scorm_package, get_staging_prefix
+from scorm_maker.verifier import verify_package
+
+from conftest import make_config, write_course
+
+BUILDS = 24
+PROCESSES = 8
+
+
+def build(args):
+    """Build one package in a worker process."""
+    input_path, output_dir, cache_dir, title, resume = args
+    config = make_config(Path(cache_dir))
+    config['package']['title'] = title
+    items = process_content(Path(input_path), config)
+    return str(generate_scorm_package(items, Path(output_dir), config, resume=resume))
+
+
+def run_builds(jobs):
+    with multiprocessing.Pool(PROCESSES) as pool:
+        return pool.map(build, jobs)
+
+
+def assert_clean_output(output_dir: Path, packages):
+    for package in packages:
+        with zipfile.ZipFile(package) as zipf:
+            assert zipf.testzip() is None
+            names = zipf.namelist()
+            assert len(names) == len(set(names))
+
+        report = verify_package(Path(package), check_crc=True)
+        assert report['valid'], report
+
+    leftovers = [
+        name for name in os.listdir(output_dir)
+        if name.startswith(STAGING_PREFIX) or name.endswith(('.partial', '.journal'))
+    ]
+    assert leftovers == []
+
+
+@pytest.mark.parametrize('resume', [False, True])
+@pytest.mark.parametrize('titles', [['Same Course'], ['Course A', 'Course B', 'Course C']])
+def test_parallel_builds_into_one_directory(tmp_path, output_dir, course_zip, course_tar, resume, titles):
+    course = write_course(tmp_path / 'big_course', extra_files=200)
+    inputs = [course, course_zip, course_tar]
+
+    jobs = [
+        (str(inputs[index % len(inputs)]), str(output_dir), str(tmp_path), titles[index % len(titles)], resume)
+        for index in range(BUILDS)
+    ]
+    packages = set(run_builds(jobs))
+
+    assert len(packages) == len(titles)
+    assert_clean_output(output_dir, packages)
+
+
+def test_stale_staging_directories_are_removed(tmp_path, output_dir, course_dir, config):
+    # A PID above the usual limits stands in for a build that was killed
+    stale = output_dir / f"{get_staging_prefix().rsplit('.', 2)[0]}.4194999.abc123"
+    stale.mkdir()
+    (stale / 'index.html').write_text('left behind')
+
+    # Directories of live builds and of other hosts are kept
+    live = output_dir / f"{get_staging_prefix()}live"
+    live.mkdir()
+    other_host = output_dir / f"{STAGING_PREFIX}.otherhost.1.abc123"
+    other_host.mkdir()
+
+    items = process_content(course_dir, config)
+    generate_scorm_package(items, output_dir, config)
+
+    assert not stale.exists()
+    assert live.exists()
+    assert other_host.exists()
+
+
+def test_missing_output_directory_is_created(tmp_path, course_dir, config):
+    output_dir = tmp_path / 'new' / 'output'
+
+    package = generate_scorm_package(process_content(course_dir, config), output_dir, config)
+
+    assert package.parent == output_dir
+    assert verify_package(package)['valid']
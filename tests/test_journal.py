@@ -0,0 +1,204 @@
+"""
+Tests for checkpointed package writing and resuming interrupted builds.
+"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+import scorm_maker.journal as journal
+from scorm_maker.content_processor import process_content
+from scorm_maker.journal import JournalError, get_journal_path, get_partial_path, load_journal
+from scorm_maker.scorm_generator import ScormGenerationError, generate_scorm_package
+from scorm_maker.verifier import verify_package
+
+from conftest import write_course
+
+EXTRA_FILES = 60
+
+
+class Interrupted(Exception):
+    """Raised to stop a build part way through."""
+
+
+@pytest.fixture
+def big_course(tmp_path):
+    return write_course(tmp_path / 'course', extra_files=EXTRA_FILES)
+
+
+@pytest.fixture(autouse=True)
+def small_checkpoints(monkeypatch):
+    monkeypatch.setattr(journal, 'CHECKPOINT_MEMBERS', 10)
+
+
+def count_writes(monkeypatch, fail_after=None):
+    """Count ZipFile.write calls, optionally failing after some of them."""
+    calls = []
+    original = zipfile.ZipFile.write
+
+    def write(self, filename, arcname=None, *args, **kwargs):
+        if fail_after is not None and len(calls) >= fail_after:
+            raise Interrupted()
+        calls.append(arcname)
+        return original(self, filename, arcname, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, 'write', write)
+    return calls
+
+
+def read_members(zip_path):
+    with zipfile.ZipFile(zip_path) as zipf:
+        return {name: zipf.read(name) for name in zipf.namelist()}
+
+
+def interrupt_build(monkeypatch, course, output_dir, config, fail_after):
+    items = process_content(course, config)
+    with monkeypatch.context() as patch:
+        count_writes(patch, fail_after=fail_after)
+        with pytest.raises(ScormGenerationError):
+            generate_scorm_package(items, output_dir, config)
+
+
+def test_interrupted_build_keeps_partial_file_and_journal(monkeypatch, big_course, output_dir, config):
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=35)
+
+    zip_path = output_dir / 'Test_Course.zip'
+    assert not zip_path.exists()
+    assert get_partial_path(zip_path).exists()
+
+    lines = get_journal_path(zip_path).read_text(encoding='utf-8').splitlines()
+    header = json.loads(lines[0])
+    assert header['version'] == journal.JOURNAL_VERSION
+    assert header['package'] == 'Test_Course.zip'
+
+    # Progress is checkpointed before the build gives up
+    assert len(lines) - 1 == 35
+
+
+def test_resume_skips_journaled_members(monkeypatch, big_course, output_dir, config, tmp_path):
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=35)
+
+    items = process_content(big_course, config)
+    calls = count_writes(monkeypatch)
+    zip_path = generate_scorm_package(items, output_dir, config, resume=True)
+
+    total = len(read_members(zip_path))
+    assert len(calls) == total - 35
+    assert not get_partial_path(zip_path).exists()
+    assert not get_journal_path(zip_path).exists()
+    assert verify_package(zip_path, check_crc=True)['valid']
+
+    # The resumed package has the same content as a fresh build
+    fresh_dir = tmp_path / 'fresh'
+    fresh_dir.mkdir()
+    monkeypatch.undo()
+    fresh = generate_scorm_package(process_content(big_course, config), fresh_dir, config)
+    assert read_members(zip_path) == read_members(fresh)
+
+
+def test_resume_rewrites_members_whose_source_changed(monkeypatch, big_course, output_dir, config):
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=35)
+
+    # Files are written in sorted order, so this is among the journaled members
+    changed = big_course / 'assets' / 'asset_0002.txt'
+    changed.write_bytes(b'changed\n')
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    items = process_content(big_course, config)
+    calls = count_writes(monkeypatch)
+    zip_path = generate_scorm_package(items, output_dir, config, resume=True)
+
+    assert calls[0] == 'assets/asset_0002.txt'
+    assert read_members(zip_path)['assets/asset_0002.txt'] == b'changed\n'
+    assert verify_package(zip_path, check_crc=True)['valid']
+
+
+def test_build_without_resume_starts_again(monkeypatch, big_course, output_dir, config):
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=35)
+
+    items = process_content(big_course, config)
+    calls = count_writes(monkeypatch)
+    zip_path = generate_scorm_package(items, output_dir, config)
+
+    assert len(calls) == len(read_members(zip_path))
+    assert not get_partial_path(zip_path).exists()
+    assert not get_journal_path(zip_path).exists()
+
+
+def test_failure_with_no_completed_members_leaves_nothing(monkeypatch, big_course, output_dir, config):
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=0)
+
+    assert sorted(os.listdir(output_dir)) == ['Test_Course.zip.lock']
+
+
+def test_members_are_journaled_at_checkpoints(tmp_path):
+    package_path = tmp_path / 'package.zip.partial'
+    journal_path = tmp_path / 'package.zip.journal'
+
+    with open(package_path, 'w+b') as fp:
+        zipf = zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED)
+        writer = journal.JournalWriter(journal_path, fp, {'source': '/a', 'package': 'package.zip'})
+        for index in range(25):
+            zipf.writestr(f'file_{index}.txt', 'data')
+            writer.record(zipf.NameToInfo[f'file_{index}.txt'], zipf.start_dir)
+
+        # A process killed now loses only the members since the last checkpoint
+        assert len(load_journal(journal_path, {'source': '/a', 'package': 'package.zip'})) == 20
+        assert writer.checkpointed == 20
+
+        writer.checkpoint()
+        writer.close()
+        zipf.close()
+
+    entries = load_journal(journal_path, {'source': '/a', 'package': 'package.zip'})
+    assert [entry['name'] for entry in entries] == [f'file_{index}.txt' for index in range(25)]
+    assert all(entry['generated'] for entry in entries)
+
+
+def test_load_journal_rejects_another_build(tmp_path):
+    journal_path = tmp_path / 'package.zip.journal'
+    journal_path.write_text(
+        json.dumps({'source': '/a', 'package': 'package.zip', 'version': journal.JOURNAL_VERSION}) + '\n',
+        encoding='utf-8'
+    )
+
+    assert load_journal(journal_path, {'source': '/a', 'package': 'package.zip'}) == []
+    with pytest.raises(JournalError):
+        load_journal(journal_path, {'source': '/b', 'package': 'package.zip'})
+    with pytest.raises(JournalError):
+        load_journal(tmp_path / 'missing.journal', {'source': '/a', 'package': 'package.zip'})
+
+
+def test_load_journal_stops_at_a_torn_line(tmp_path):
+    header = {'source': '/a', 'package': 'package.zip'}
+    journal_path = tmp_path / 'package.zip.journal'
+    journal_path.write_text(
+        json.dumps(dict(header, version=journal.JOURNAL_VERSION)) + '\n'
+        + json.dumps({'name': 'a.html'}) + '\n'
+        + '{"name": "b.ht',
+        encoding='utf-8'
+    )
+
+    assert load_journal(journal_path, header) == [{'name': 'a.html'}]
+
+
+@pytest.mark.parametrize('output_name', ['dist', '.'])
+def test_output_directory_inside_the_input_is_not_packaged(monkeypatch, big_course, config, output_name):
+    output_dir = big_course / output_name
+    output_dir.mkdir(exist_ok=True)
+
+    # A package from an earlier build and an interrupted build are both left behind
+    generate_scorm_package(process_content(big_course, config), output_dir, config)
+    interrupt_build(monkeypatch, big_course, output_dir, config, fail_after=35)
+
+    items = process_content(big_course, config)
+    zip_path = generate_scorm_package(items, output_dir, config, resume=True)
+
+    names = read_members(zip_path)
+    assert not [name for name in names if name.startswith('dist/') or 'Test_Course.zip' in name]
+    assert not [name for name in names if 'scorm_package_temp' in name]
+    assert names['assets/asset_0000.txt'] == (big_course / 'assets' / 'asset_0000.txt').read_bytes()
+    assert verify_package(zip_path, check_crc=True)['valid']
@@ -0,0 +1,146 @@
+"""
+Tests for minifying the generated runtime assets.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from scorm_maker import minifier
+from scorm_maker.minifier import minify, minify_css, minify_html, minify_js, prune_minified_cache
+from scorm_maker.scorm_generator import generate_scorm_api_wrapper
+
+from conftest import make_config
+
+NODE = shutil.which('node')
+
+
+@pytest.mark.parametrize('source, expected', [
+    # Strings keep comment markers, quotes and spacing
+    (
+        "var url = 'http://example.com'; // trailing\nvar s = \"a // b /* c */\";",
+        "var url = 'http://example.com';\nvar s = \"a // b /* c */\";",
+    ),
+    ("var s = 'it\\'s  /here/';", "var s = 'it\\'s  /here/';"),
+    # Regular expressions, including '/' in a class and escaped
+    ("var r = /ab+c\\/d[/]/gi; // done", "var r = /ab+c\\/d[/]/gi;"),
+    ("function f(s) {\n    return /^\\s*$/.test(s);\n}", "function f(s) {\nreturn /^\\s*$/.test(s);\n}"),
+    ("var t = typeof /x/;", "var t = typeof /x/;"),
+    ("if (!/['\"]/.test(s)) { x = 1; }", "if (!/['\"]/.test(s)) { x = 1; }"),
+    # Divisions are not regular expressions
+    ("var x = a / b / c; // it's", "var x = a / b / c;"),
+    ("var d = a[0] / 2 / b.c; // it's", "var d = a[0] / 2 / b.c;"),
+    ("var q = (a) / 2; // it's", "var q = (a) / 2;"),
+    ("var e = x++ / 2; // it's\nvar f = 1;", "var e = x++ / 2;\nvar f = 1;"),
+    # Template literals, nested and with braces in their expressions
+    ("var t = `a ${ `b ${c} d` } e`;", "var t = `a ${ `b ${c} d` } e`;"),
+    ("var o = `${ {a: 1}.a } and ${ fn({b: {c: 2}}) }`; // x", "var o = `${ {a: 1}.a } and ${ fn({b: {c: 2}}) }`;"),
+    ("var t = `line 1\n    line 2 // not a comment ${x}`;", "var t = `line 1\n    line 2 // not a comment ${x}`;"),
+    ("var t = `\\` ${'`'} /* kept */`;", "var t = `\\` ${'`'} /* kept */`;"),
+    # Comments next to other tokens
+    ("a/*c*/b\nc/*\nmulti\n*/d", "a b\nc d"),
+    ("x = 1 /* c */ + 2;\n\n\n    y = 2;", "x = 1 + 2;\ny = 2;"),
+    ("f(a, /* b */ c);", "f(a, c);"),
+    ("return x; /* end */", "return x;"),
+    ("if (a) {\n\treturn  b;\n}", "if (a) {\nreturn b;\n}"),
+])
+def test_minify_js(source, expected):
+    assert minify_js(source) == expected
+
+
+@pytest.mark.parametrize('source, expected', [
+    ("a::after {  content: \"x  y\" ;  }", 'a::after{content:"x  y"}'),
+    ("b  >  c { font-family: 'A  B', serif; }", "b>c{font-family:'A  B',serif}"),
+    ('a { background: url("a  b.png") }', 'a{background:url("a  b.png")}'),
+    ('a { content: "/* not a comment */"; }', 'a{content:"/* not a comment */"}'),
+    ('p { content: "a\\"  b"; }', 'p{content:"a\\"  b"}'),
+    ('/* header */\nbody {\n    margin: 0; /* reset */\n}\n\n.a .b { color: red; }', 'body{margin:0}.a .b{color:red}'),
+    ('a { color: red; } /* unterminated', 'a{color:red}'),
+])
+def test_minify_css(source, expected):
+    assert minify_css(source) == expected
+
+
+def test_minify_html_minifies_inline_blocks_only():
+    source = (
+        '<!DOCTYPE html>\n<html>\n  <head>\n    <!-- comment -->\n'
+        '    <style>\n      p::before { content: "a  b"; }\n    </style>\n'
+        '    <script src="app.js"></script>\n'
+        '    <script>\n      var a = 1; // one\n    </script>\n  </head>\n'
+        '  <body>\n    <pre>\n  keep   this\n    </pre>\n  </body>\n</html>\n'
+    )
+
+    assert minify_html(source) == (
+        '<!DOCTYPE html>\n<html>\n<head>\n'
+        '<style>p::before{content:"a  b"}</style>\n'
+        '<script src="app.js"></script>\n'
+        '<script>\nvar a = 1;\n</script>\n</head>\n<body>\n'
+        '<pre>\n  keep   this\n    </pre>\n</body>\n</html>'
+    )
+
+
+@pytest.mark.skipif(NODE is None, reason="Node.js is needed to check the minified scripts")
+@pytest.mark.parametrize('scorm_version', ['1.2', '2004_4th'])
+def test_minified_api_wrapper_is_valid_javascript(tmp_path, scorm_version):
+    config = make_config(tmp_path, scorm_version=scorm_version)
+    config['build']['minify'] = True
+    generate_scorm_api_wrapper(tmp_path, config)
+
+    script = tmp_path / 'scorm_package' / 'SCORM_API_wrapper.js'
+    subprocess.run([NODE, '--check', str(script)], check=True, capture_output=True)
+
+
+def write_cache_entry(cache_dir, key, age):
+    path = cache_dir / 'minified' / key[:2] / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('cached')
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_prune_removes_old_and_least_recently_used_entries(tmp_path):
+    recent = [write_cache_entry(tmp_path, f'{index:02d}' + 'a' * 62, age=index * 60) for index in range(5)]
+    old = write_cache_entry(tmp_path, 'ff' + 'b' * 62, age=minifier.CACHE_MAX_AGE + 60)
+    stale_tmp = write_cache_entry(tmp_path, 'ff' + 'c' * 62 + '.123.tmp', age=minifier.CACHE_MAX_AGE + 60)
+    fresh_tmp = write_cache_entry(tmp_path, 'ff' + 'd' * 62 + '.123.tmp', age=0)
+
+    assert prune_minified_cache(tmp_path, max_entries=3) == 4
+
+    assert [path.exists() for path in recent] == [True, True, True, False, False]
+    assert not old.exists()
+    assert not stale_tmp.exists()
+    assert fresh_tmp.exists()
+
+
+def test_prune_without_a_cache_does_nothing(tmp_path):
+    assert prune_minified_cache(tmp_path / 'missing') == 0
+
+
+def test_cache_hits_keep_entries_fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(minifier, '_memory_cache', {})
+    minify('a { color: red; }', 'css', tmp_path)
+    (entry,) = [path for path in (tmp_path / 'minified').rglob('*') if path.is_file()]
+    old = time.time() - minifier.CACHE_MAX_AGE + 60
+    os.utime(entry, (old, old))
+
+    monkeypatch.setattr(minifier, '_memory_cache', {})
+    assert minify('a { color: red; }', 'css', tmp_path) == 'a{color:red}'
+
+    assert entry.stat().st_mtime > old + 3600
+
+
+def test_cache_is_pruned_once_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(minifier, 'CACHE_MAX_ENTRIES', 2)
+    for index in range(4):
+        write_cache_entry(tmp_path, f'{index:02d}' + 'a' * 62, age=3600 + index)
+
+    minify('p { margin: 0; }', 'css', tmp_path)
+    minify('p { margin: 1px; }', 'css', tmp_path)
+
+    # The two oldest entries are pruned, and the new ones are not pruned again
+    entries = [path for path in (tmp_path / 'minified').rglob('*') if path.is_file()]
+    assert len(entries) == 4
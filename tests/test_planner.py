@@ -0,0 +1,66 @@
+"""
+Tests for planning builds without building them.
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from scorm_maker.content_processor import process_content
+from scorm_maker.planner import plan_package, scan_directory
+from scorm_maker.scorm_generator import generate_scorm_package
+
+from conftest import COURSE_FILES
+
+
+def symlink(target, link, target_is_directory=False):
+    try:
+        os.symlink(target, link, target_is_directory=target_is_directory)
+    except (OSError, NotImplementedError):
+        pytest.skip("Symbolic links are not supported here")
+
+
+def test_plan_counts_every_input_file(course_dir, config):
+    plan = plan_package(course_dir, config)
+
+    assert plan['files'] == len(COURSE_FILES)
+    assert plan['input_size'] == sum(len(data) for data in COURSE_FILES.values())
+    assert [item['path'] for item in plan['content_items']] == [
+        '01_intro.html', '02_manual.pdf', '03_summary.html', 'img/logo.png'
+    ]
+
+
+def test_plan_of_a_zip_uses_compressed_sizes(course_zip, config):
+    plan = plan_package(course_zip, config)
+
+    assert plan['files'] == len(COURSE_FILES)
+    assert {entry['ratio_source'] for entry in plan['types']} == {'archive'}
+
+
+def test_plan_counts_what_the_build_packages(tmp_path, course_dir, output_dir, config):
+    linked = tmp_path / 'linked'
+    linked.mkdir()
+    (linked / 'large.bin').write_bytes(b'\0' * 100000)
+    symlink(linked, course_dir / 'linked', target_is_directory=True)
+    symlink(course_dir / 'img' / 'logo.png', course_dir / 'logo_link.png')
+
+    plan = plan_package(course_dir, config)
+    package = generate_scorm_package(process_content(course_dir, config), output_dir, config)
+
+    with zipfile.ZipFile(package) as zipf:
+        content_names = {name for name in zipf.namelist() if not name.startswith('scorm_package/')}
+    content_names -= {'index.html', 'imsmanifest.xml'}
+
+    scanned = {name for name, _ in scan_directory(course_dir)}
+    assert scanned == set(COURSE_FILES) | {'logo_link.png'}
+    assert scanned == content_names
+    assert plan['files'] == len(COURSE_FILES) + 1
+
+
+def test_plan_survives_a_symlink_loop(course_dir, config):
+    symlink('..', course_dir / 'css' / 'loop', target_is_directory=True)
+
+    plan = plan_package(course_dir, config)
+
+    assert plan['files'] == len(COURSE_FILES)
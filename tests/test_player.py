@@ -0,0 +1,31 @@
+"""
+Tests for the generated player page.
+"""
+
+import re
+
+import pytest
+
+from scorm_maker import scorm_generator
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import generate_index_html
+
+from conftest import make_config
+
+
+@pytest.mark.parametrize('minify', [False, True])
+def test_nav_row_height_sets_both_style_and_script(monkeypatch, tmp_path, course_dir, minify):
+    monkeypatch.setattr(scorm_generator, 'NAV_ROW_HEIGHT', 52)
+    config = make_config(tmp_path)
+    config['build']['minify'] = minify
+
+    generate_index_html(tmp_path, process_content(course_dir, config), config)
+    page = (tmp_path / 'index.html').read_text(encoding='utf-8')
+
+    assert re.search(r'--nav-row-height:\s*52px', page)
+    assert re.search(r'const NAV_ROW_HEIGHT = 52;', page)
+
+    # The row style has no fixed height of its own
+    style = re.search(r'\.nav-item\s*\{([^}]*)\}', page).group(1)
+    assert re.search(r'height:\s*calc\(var\(--nav-row-height\) - 4px\)', style)
+    assert not re.search(r'height:\s*\d', style)
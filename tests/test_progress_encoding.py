@@ -0,0 +1,120 @@
+"""
+Tests for the suspend_data progress encoding used by the generated player.
+
+The encoder and decoder are JavaScript in the generated SCORM API wrapper,
+so they are run with Node.js, and their output is checked against a decoder
+written here from the format description.
+"""
+
+import base64
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from scorm_maker.scorm_generator import generate_scorm_api_wrapper
+
+from conftest import make_config
+
+NODE = shutil.which('node')
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="Node.js is needed to run the player scripts")
+
+RUNNER = """
+const fs = require('fs');
+global.window = global;
+eval(fs.readFileSync(process.argv[1], 'utf8') + ';global.SCORM_API = SCORM_API;');
+console.error = () => {};
+const cases = JSON.parse(fs.readFileSync(0, 'utf8'));
+const results = cases.map(function(testCase) {
+    if (testCase.encoded !== undefined) {
+        return Array.from(SCORM_API.decodeProgress(testCase.encoded, testCase.count));
+    }
+    const encoded = SCORM_API.encodeProgress(Uint8Array.from(testCase.status));
+    return [encoded, Array.from(SCORM_API.decodeProgress(encoded, testCase.status.length))];
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def run_player_codec(tmp_path, scorm_version, cases):
+    config = make_config(tmp_path, scorm_version=scorm_version)
+    generate_scorm_api_wrapper(tmp_path, config)
+
+    result = subprocess.run(
+        [NODE, '-e', RUNNER, str(tmp_path / 'scorm_package' / 'SCORM_API_wrapper.js')],
+        input=json.dumps(cases),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def decode_reference(encoded, count):
+    """Decode progress as described in the format comment of the wrapper."""
+    status = [0] * count
+    if encoded.startswith('B'):
+        data = base64.urlsafe_b64decode(encoded[1:] + '=' * (-len(encoded[1:]) % 4))
+        for index in range(min(count, len(data) * 8)):
+            status[index] = (data[index >> 3] >> (index & 7)) & 1
+    elif encoded.startswith('R') and len(encoded) > 1:
+        index, value = 0, 0
+        for run in encoded[1:].split('.'):
+            end = min(count, index + int(run, 36))
+            for position in range(index, end):
+                status[position] = value
+            index, value = end, 1 - value
+    return status
+
+
+def progress_cases():
+    generator = random.Random(1234)
+    count = 10000
+    return {
+        'random': [generator.randrange(2) for _ in range(count)],
+        'empty': [0] * count,
+        'full': [1] * count,
+        'prefix': [1 if index < 3000 else 0 for index in range(count)],
+        'sparse': [1 if index % 997 == 0 else 0 for index in range(count)],
+        'small': [1, 0, 1, 1, 0, 0, 1],
+        'none': [],
+    }
+
+
+@pytest.mark.parametrize('scorm_version', ['1.2', '2004_4th'])
+def test_progress_round_trips_in_the_documented_format(tmp_path, scorm_version):
+    cases = progress_cases()
+    results = run_player_codec(tmp_path, scorm_version, [{'status': status} for status in cases.values()])
+
+    for (name, status), (encoded, decoded) in zip(cases.items(), results):
+        assert decoded == status, name
+        assert decode_reference(encoded, len(status)) == status, name
+        assert encoded[0] in 'BR', name
+
+        # 10,000 items always fit in SCORM 1.2's 4,096 characters
+        assert len(encoded) <= 1668, name
+
+
+def test_shorter_encoding_is_chosen(tmp_path):
+    cases = progress_cases()
+    results = run_player_codec(tmp_path, '2004_4th', [
+        {'status': cases['prefix']},
+        {'status': cases['random']},
+    ])
+
+    assert results[0][0] == 'R0.2bc'
+    assert results[1][0].startswith('B')
+
+
+def test_unreadable_progress_is_treated_as_none(tmp_path):
+    results = run_player_codec(tmp_path, '2004_4th', [
+        {'encoded': 'Rzz!.x', 'count': 10},
+        {'encoded': 'B!!', 'count': 3},
+        {'encoded': 'garbage', 'count': 3},
+        {'encoded': '', 'count': 2},
+    ])
+
+    assert results == [[0] * 10, [0] * 3, [0] * 3, [0] * 2]
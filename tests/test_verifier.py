@@ -0,0 +1,171 @@
+"""
+Tests for verifying existing packages.
+"""
+
+import zipfile
+
+import pytest
+
+from scorm_maker.cli import parse_verify_args
+from scorm_maker.content_processor import process_content
+from scorm_maker.scorm_generator import generate_scorm_package
+from scorm_maker.verifier import normalize_href, verify_package, verify_packages
+
+MANIFEST = (
+    '<manifest identifier="m"><resources>'
+    '<resource identifier="r" href="index.html"><file href="index.html"/></resource>'
+    '</resources></manifest>'
+)
+
+
+def write_package(path, members=0):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('imsmanifest.xml', MANIFEST)
+        zipf.writestr('index.html', '<html>' + 'Welcome. ' * 2000 + '</html>')
+        for index in range(members):
+            zipf.writestr(f'extra_{index}.txt', 'x' * 100)
+    return path
+
+
+def corrupt_member(path, name):
+    with zipfile.ZipFile(path) as zipf:
+        info = zipf.getinfo(name)
+    data = bytearray(path.read_bytes())
+    start = info.header_offset + 30 + len(name)
+    for offset in range(start + 5, start + 40):
+        data[offset] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+
+def test_valid_package_with_many_members(tmp_path):
+    report = verify_package(write_package(tmp_path / 'many.zip', members=2000), check_crc=True)
+
+    assert report['valid'], report
+    assert report['members'] == 2002
+    assert len(report['orphaned']) == 2000
+
+
+def test_corrupt_member_data_is_reported(tmp_path):
+    package = write_package(tmp_path / 'bad.zip')
+    corrupt_member(package, 'index.html')
+
+    report = verify_package(package, check_crc=True)
+
+    assert not report['valid']
+    assert report['crc_errors'] == ['index.html']
+    assert report['errors'] == []
+
+
+def test_one_bad_package_does_not_stop_the_others(tmp_path):
+    write_package(tmp_path / 'a_good.zip')
+    corrupt_member(write_package(tmp_path / 'b_bad.zip'), 'index.html')
+    (tmp_path / 'c_not_a_zip.zip').write_bytes(b'not a zip file')
+
+    reports = verify_packages([tmp_path], check_crc=True, workers=4)
+
+    assert [report['valid'] for report in reports] == [True, False, False]
+    assert reports[1]['crc_errors'] == ['index.html']
+    assert reports[2]['errors']
+
+
+def write_manifest_package(path, manifest, names):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('imsmanifest.xml', manifest)
+        for name in names:
+            zipf.writestr(name, 'content')
+    return path
+
+
+def test_missing_members_and_duplicate_identifiers_are_reported(tmp_path):
+    manifest = (
+        '<manifest identifier="m" xmlns="http://www.imsglobal.org/xsd/imscp_v1p1">'
+        '<organizations><organization identifier="org"><item identifier="i1" identifierref="r1"/>'
+        '<item identifier="i1" identifierref="r2"/></organization></organizations>'
+        '<resources>'
+        '<resource identifier="r1" href="index.html"><file href="index.html"/><file href="css/missing.css"/></resource>'
+        '<resource identifier="r2" href="gone.html"><file href="gone.html"/></resource>'
+        '<resource identifier="r2" href="index.html"/>'
+        '</resources></manifest>'
+    )
+    package = write_manifest_package(tmp_path / 'bad_manifest.zip', manifest, ['index.html', 'unused.png'])
+
+    report = verify_package(package)
+
+    assert not report['valid']
+    assert report['missing'] == ['css/missing.css', 'gone.html']
+    assert report['duplicate_identifiers'] == ['i1', 'r2']
+    assert report['orphaned'] == ['unused.png']
+    assert report['errors'] == []
+
+
+def test_orphaned_members_do_not_make_a_package_invalid(tmp_path):
+    package = write_manifest_package(tmp_path / 'orphans.zip', MANIFEST, ['index.html', 'notes.txt', 'img/a.png'])
+
+    report = verify_package(package)
+
+    assert report['valid'], report
+    assert report['orphaned'] == ['img/a.png', 'notes.txt']
+
+
+def test_hrefs_are_matched_to_member_names(tmp_path):
+    manifest = (
+        '<manifest identifier="m"><resources>'
+        '<resource identifier="r" href="./index.html?lesson=1#top">'
+        '<file href="./index.html"/><file href="media/my%20video.mp4"/>'
+        '<file href="./css/style.css#x"/><file href="docs\\guide.pdf"/>'
+        '</resource></resources></manifest>'
+    )
+    names = ['index.html', 'media/my video.mp4', 'css/style.css', 'docs/guide.pdf']
+    package = write_manifest_package(tmp_path / 'hrefs.zip', manifest, names)
+
+    report = verify_package(package)
+
+    assert report['valid'], report
+    assert report['orphaned'] == []
+
+
+@pytest.mark.parametrize('href, name', [
+    ('index.html', 'index.html'),
+    ('./index.html', 'index.html'),
+    ('././a/b.html', 'a/b.html'),
+    ('my%20file.html', 'my file.html'),
+    ('page.html?query=1', 'page.html'),
+    ('page.html#frag', 'page.html'),
+    ('page%3F.html?x#y', 'page?.html'),
+    ('dir\\page.html', 'dir/page.html'),
+])
+def test_normalize_href(href, name):
+    assert normalize_href(href) == name
+
+
+def test_package_without_manifest_is_invalid(tmp_path):
+    package = tmp_path / 'empty.zip'
+    with zipfile.ZipFile(package, 'w') as zipf:
+        zipf.writestr('index.html', 'content')
+
+    report = verify_package(package)
+
+    assert not report['valid']
+    assert 'imsmanifest.xml' in report['errors'][0]
+
+
+def test_generated_package_verifies(course_dir, output_dir, config):
+    package = generate_scorm_package(process_content(course_dir, config), output_dir, config)
+
+    report = verify_package(package, check_crc=True)
+
+    assert report['valid'], report
+    assert report['missing'] == []
+
+
+@pytest.mark.parametrize('workers', ['0', '-1', 'many'])
+def test_verify_rejects_invalid_worker_counts(workers, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        parse_verify_args(['package.zip', '--workers', workers])
+
+    assert excinfo.value.code == 2
+    assert 'positive integer' in capsys.readouterr().err
+
+
+def test_verify_accepts_a_worker_count():
+    assert parse_verify_args(['package.zip', '--workers', '3']).workers == 3